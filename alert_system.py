@@ -190,4 +190,6 @@ def main():
 
 
 if __name__ == "__main__":
+    from ibf_database import configure_logging
+    configure_logging()
     alerts = main()
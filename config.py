@@ -45,6 +45,13 @@ DATA_FILES = {
     'exposure_csv': DATA_DIR / 'exposure_nigeria_lga_aggregated.csv',
 }
 
+# Keep a Parquet copy of each input under data/cache/ (refreshed when the CSV changes)
+USE_PARQUET_CACHE = True
+
+# Keep a Feather copy of the integrated LGA table under data/cache/
+# (rebuilt when any input CSV or the integration code changes)
+USE_INTEGRATED_CACHE = True
+
 # ============================================================================
 # FORECAST PARAMETERS
 # ============================================================================
@@ -31,6 +31,7 @@ class IBFForecastEngine:
         self.database = None
         self.forecasts = None
         self.alerts = None
+        self._alert_summary = None
         self.run_timestamp = datetime.now()
         
     def run_full_forecast(self):
@@ -56,6 +57,7 @@ class IBFForecastEngine:
             displacement_threshold=5000,
             probability_threshold=0.40
         )
+        self._alert_summary = self._summarize_alerts()
         
         # Step 4: Export results
         print("\n💾 STEP 4: Exporting results...")
@@ -70,6 +72,20 @@ class IBFForecastEngine:
             'timestamp': self.run_timestamp
         }
     
+    def _summarize_alerts(self):
+        """Compute alert statistics once for the report and console summary"""
+        
+        if self.alerts is None or len(self.alerts) == 0:
+            return None
+        
+        top5 = self.alerts.head(5).to_dict('records')
+        return {
+            'total': len(self.alerts),
+            'level_counts': self.alerts['alert_level'].value_counts().to_dict(),
+            'top5': top5,
+            'top3': top5[:3]
+        }
+    
     def _export_results(self, alert_system):
         """Export all results"""
         
@@ -115,18 +131,19 @@ class IBFForecastEngine:
             f.write(f"Total LGAs analyzed: {len(self.database.integrated_lga)}\n")
             f.write(f"Forecasts generated: {len(self.forecasts)}\n")
             
-            if self.alerts is not None and len(self.alerts) > 0:
-                f.write(f"Alerts issued: {len(self.alerts)}\n\n")
+            summary = self._alert_summary
+            if summary is not None:
+                f.write(f"Alerts issued: {summary['total']}\n\n")
                 
                 f.write("ALERT BREAKDOWN\n")
                 f.write("-"*70 + "\n")
                 for level in ['critical', 'severe', 'moderate']:
-                    count = (self.alerts['alert_level'] == level).sum()
+                    count = summary['level_counts'].get(level, 0)
                     f.write(f"{level.upper():10s} {count:3d} alerts\n")
                 
                 f.write("\nTOP 5 PRIORITY AREAS\n")
                 f.write("-"*70 + "\n")
-                for i, (_, row) in enumerate(self.alerts.head(5).iterrows(), 1):
+                for i, row in enumerate(summary['top5'], 1):
                     f.write(f"\n{i}. {row['lga']}, {row['state']}\n")
                     f.write(f"   Hazard: {row['hazard_type']}\n")
                     f.write(f"   Expected Displacement: {row['expected_displacement']:,}\n")
@@ -153,15 +170,16 @@ class IBFForecastEngine:
         print(f"\n📊 Results:")
         print(f"   Forecasts generated: {len(self.forecasts)}")
         
-        if self.alerts is not None and len(self.alerts) > 0:
-            print(f"   Alerts issued: {len(self.alerts)}")
+        summary = self._alert_summary
+        if summary is not None:
+            print(f"   Alerts issued: {summary['total']}")
             
-            critical_count = (self.alerts['alert_level'] == 'critical').sum()
+            critical_count = summary['level_counts'].get('critical', 0)
             if critical_count > 0:
                 print(f"\n🔴 {critical_count} CRITICAL ALERTS require immediate attention!")
             
             print(f"\n🎯 Top 3 Priority Areas:")
-            for i, (_, row) in enumerate(self.alerts.head(3).iterrows(), 1):
+            for i, row in enumerate(summary['top3'], 1):
                 print(f"   {i}. {row['lga']}, {row['state']}")
                 print(f"      {row['hazard_type'].upper()}: {row['expected_displacement']:,} displaced")
         else:
@@ -200,4 +218,6 @@ def main():
 
 
 if __name__ == "__main__":
+    from ibf_database import configure_logging
+    configure_logging()
     results = main()
@@ -10,12 +10,29 @@ import numpy as np
 from datetime import datetime, timedelta
 import config
 
+
 class ConflictForecastModel:
     """
     Forecast conflict-related displacement
     Based on historical patterns, trends, and seasonal factors
     """
     
+    # Output columns; float and nullable columns may be missing from vulnerability-based forecasts
+    FORECAST_COLUMNS = {
+        'lga': object,
+        'state': object,
+        'forecast_week': np.int16,
+        'expected_displacement': np.int32,
+        'lower_bound': np.float64,
+        'upper_bound': np.float64,
+        'probability': np.float64,
+        'confidence': object,
+        'method': object,
+        'risk_level': object,
+        'historical_events': pd.Int32Dtype(),
+        'trend': object
+    }
+    
     def __init__(self, database):
         """
         Args:
@@ -149,12 +166,13 @@ class ConflictForecastModel:
         high_risk = self.db.get_high_risk_lgas(threshold=risk_threshold)
         
         forecasts = []
-        for _, row in high_risk.iterrows():
-            forecast = self.forecast_lga(row['state'], row['lga'])
+        for state, lga in zip(high_risk['state'], high_risk['lga']):
+            forecast = self.forecast_lga(state, lga)
             if forecast:
                 forecasts.append(forecast)
         
-        return pd.DataFrame(forecasts)
+        # Declared dtypes in one pass; keys a forecast lacks stay empty
+        return pd.DataFrame(forecasts, columns=list(self.FORECAST_COLUMNS)).astype(self.FORECAST_COLUMNS)
 
 
 class FloodForecastModel:
@@ -163,6 +181,20 @@ class FloodForecastModel:
     Based on historical flood patterns and risk scores
     """
     
+    # Output columns; float and nullable columns may be missing from low-risk forecasts
+    FORECAST_COLUMNS = {
+        'lga': object,
+        'state': object,
+        'forecast_week': np.int16,
+        'expected_affected': np.int32,
+        'expected_displacement': np.float64,
+        'probability': np.float64,
+        'confidence': object,
+        'risk_level': object,
+        'in_flood_season': bool,
+        'historical_events': pd.Int32Dtype()
+    }
+    
     def __init__(self, database):
         """
         Args:
@@ -266,12 +298,13 @@ class FloodForecastModel:
         ].sort_values('flood_risk', ascending=False)
         
         forecasts = []
-        for _, row in flood_prone.iterrows():
-            forecast = self.forecast_lga(row['state'], row['lga'])
+        for state, lga in zip(flood_prone['state'], flood_prone['lga']):
+            forecast = self.forecast_lga(state, lga)
             if forecast:
                 forecasts.append(forecast)
         
-        return pd.DataFrame(forecasts)
+        # Declared dtypes in one pass; keys a forecast lacks stay empty
+        return pd.DataFrame(forecasts, columns=list(self.FORECAST_COLUMNS)).astype(self.FORECAST_COLUMNS)
 
 
 class MultiHazardForecast:
@@ -309,6 +342,7 @@ class MultiHazardForecast:
         # Combine
         print("\n🔗 Integrating forecasts...")
         integrated = self._integrate_forecasts(conflict_forecasts, flood_forecasts)
+        integrated = self._downcast_forecasts(integrated)
         
         print(f"✅ {len(integrated)} total forecasts")
         print("="*70)
@@ -335,6 +369,23 @@ class MultiHazardForecast:
         
         return all_forecasts
 
+    def _downcast_forecasts(self, forecasts):
+        """Downcast numeric forecast columns to 32/16-bit dtypes for export"""
+        
+        # Counts fit comfortably in int32, probabilities in float32. Columns
+        # only filled by one hazard model are empty for the other, so the
+        # integers are nullable
+        dtypes = {
+            'expected_displacement': 'Int32',
+            'expected_affected': 'Int32',
+            'lower_bound': 'Int32',
+            'upper_bound': 'Int32',
+            'probability': 'float32',
+            'forecast_week': 'Int16'
+        }
+        
+        return forecasts.astype({col: dtype for col, dtype in dtypes.items() if col in forecasts.columns})
+
 
 def main():
     """Test forecast models"""
@@ -373,4 +424,6 @@ def main():
 
 
 if __name__ == "__main__":
+    from ibf_database import configure_logging
+    configure_logging()
     forecasts = main()
@@ -51,8 +51,12 @@ def generate_nigeria_centroids(
     logger.info(f"Grid resolution: {res_lat:.5f}° lat, {res_lon:.5f}° lon")
     
     # Create coordinate arrays
-    lat = np.arange(lat_min, lat_max, res_lat)
-    lon = np.arange(lon_min, lon_max, res_lon)
+    # linspace with an explicit point count avoids np.arange float drift,
+    # which can silently drop (or add) the last row/column of the grid
+    n_lat = int(round((lat_max - lat_min) / res_lat))
+    n_lon = int(round((lon_max - lon_min) / res_lon))
+    lat = np.linspace(lat_min, lat_max, n_lat, endpoint=False)
+    lon = np.linspace(lon_min, lon_max, n_lon, endpoint=False)
     
     # Create 2D meshgrid
     lon_grid, lat_grid = np.meshgrid(lon, lat)
@@ -73,13 +77,20 @@ def generate_nigeria_centroids(
     centroids.write_hdf5(output_file)
     
     # Print summary
-    print_summary(centroids, output_file)
+    print_summary(centroids, output_file, res_lat=res_lat)
     
     return centroids
 
 
-def print_summary(centroids: Centroids, output_file: str):
-    """Print summary of generated centroids"""
+def print_summary(centroids: Centroids, output_file: str, res_lat: float = None):
+    """
+    Print summary of generated centroids
+    
+    Args:
+        centroids: Centroids object
+        output_file: Path of the written HDF5 file
+        res_lat: Grid latitude step in degrees, if known (skips estimating it)
+    """
     
     # Get file size
     file_path = Path(output_file)
@@ -89,13 +100,19 @@ def print_summary(centroids: Centroids, output_file: str):
         file_size = 0
     
     # Calculate average spacing (for verification)
-    lat_sorted = np.sort(centroids.lat)
-    lat_diffs = np.diff(lat_sorted)
-    lat_diffs = lat_diffs[lat_diffs > 1e-6]  # Remove zeros
-    if len(lat_diffs) > 0:
-        avg_spacing_km = np.median(lat_diffs) * 111  # Convert to km
+    if res_lat is not None:
+        avg_spacing_km = res_lat * 111  # Uniform grid - spacing is known
     else:
-        avg_spacing_km = 0
+        # Estimate from a sample rather than sorting every centroid
+        rng = np.random.default_rng(0)
+        n_sample = min(10000, len(centroids.lat))
+        lat_sorted = np.sort(rng.choice(centroids.lat, size=n_sample, replace=False))
+        lat_diffs = np.diff(lat_sorted)
+        lat_diffs = lat_diffs[lat_diffs > 1e-6]  # Remove zeros
+        if len(lat_diffs) > 0:
+            avg_spacing_km = np.median(lat_diffs) * 111  # Convert to km
+        else:
+            avg_spacing_km = 0
     
     print("\n" + "="*70)
     print("CENTROIDS GENERATION SUMMARY")
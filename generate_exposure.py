@@ -11,12 +11,40 @@ import pandas as pd
 import geopandas as gpd
 from pathlib import Path
 import logging
+import shutil
 from datetime import datetime
 
+from table_io import write_csv
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _downcast_exposure(df):
+    """
+    Shrink a point-level exposure frame in place before it is written
+    
+    Coordinates, values and population become float32 (~7 significant
+    digits - ample for 30" coordinates and per-cell USD values), and the
+    repeated metadata columns become categoricals with a single entry.
+    Columns are replaced one at a time, so the frame itself is not copied.
+    """
+    for col in ['lat', 'lon', 'exposure_value_usd', 'population']:
+        if col in df.columns:
+            df[col] = df[col].astype(np.float32)
+    
+    for col in ['exposure_type', 'data_source', 'generated_date', 'admin_region']:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    
+    return df
+
+
+def _constant_column(value, n):
+    """One-category Categorical for a column that holds the same value on every row"""
+    return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[value])
+
+
 def generate_exposure_litpop(resolution_arcsec=30, save_format='both'):
     """
     Generate exposure using CLIMADA LitPop (Lit: Nightlight + Pop: Population)
@@ -24,7 +52,8 @@ def generate_exposure_litpop(resolution_arcsec=30, save_format='both'):
     
     Args:
         resolution_arcsec: Resolution in arc seconds (30 = ~1km, 150 = ~5km)
-        save_format: 'csv', 'hdf5', or 'both'
+        save_format: 'csv', 'hdf5', 'both' (CSV + HDF5) or 'parquet'.
+            The Parquet file is written for every format.
     
     Returns:
         Exposure dataframe
@@ -52,41 +81,51 @@ def generate_exposure_litpop(resolution_arcsec=30, save_format='both'):
         
         logger.info(f"Generated exposure for {len(exposure.gdf):,} points")
         
-        # Convert to DataFrame
-        df = exposure.gdf.copy()
+        Path('data').mkdir(exist_ok=True)
+        
+        if save_format in ['hdf5', 'both']:
+            # Save as HDF5 (faster loading, compressed) - before the frame
+            # below is renamed in place, as CLIMADA expects its own columns
+            hdf5_file = 'data/nigeria_exposure.hdf5'
+            exposure.write_hdf5(hdf5_file)
+            file_size = Path(hdf5_file).stat().st_size / (1024*1024)
+            logger.info(f"Saved HDF5: {hdf5_file} ({file_size:.1f} MB)")
+        
+        # Work on CLIMADA's frame directly rather than a full copy of it
+        df = exposure.gdf
         
         # Rename columns for clarity
-        df = df.rename(columns={
+        df.rename(columns={
             'latitude': 'lat',
             'longitude': 'lon',
             'value': 'exposure_value_usd',
             'region_id': 'admin_region'
-        })
+        }, inplace=True)
         
-        # Add metadata
-        df['exposure_type'] = 'litpop'
+        # Add metadata (constant columns are stored as single-entry categoricals)
+        n = len(df)
+        df['exposure_type'] = _constant_column('litpop', n)
         df['resolution_km'] = resolution_arcsec / 30.0
-        df['data_source'] = 'CLIMADA_LitPop'
-        df['generated_date'] = datetime.now().strftime('%Y-%m-%d')
+        df['data_source'] = _constant_column('CLIMADA_LitPop', n)
+        df['generated_date'] = _constant_column(datetime.now().strftime('%Y-%m-%d'), n)
         
-        # Save in requested format(s)
-        Path('data').mkdir(exist_ok=True)
+        df = _downcast_exposure(df)
+        
+        # Point outputs are written without geometry (lat/lon carry the location)
+        point_cols = [col for col in df.columns if col != 'geometry']
+        
+        # Parquet is the canonical point-level output
+        parquet_file = 'data/nigeria_exposure.parquet'
+        pd.DataFrame(df[point_cols]).to_parquet(parquet_file, compression='zstd', index=False)
+        file_size = Path(parquet_file).stat().st_size / (1024*1024)
+        logger.info(f"Saved Parquet: {parquet_file} ({file_size:.1f} MB)")
         
         if save_format in ['csv', 'both']:
-            # Save as CSV (without geometry for smaller file)
             csv_file = 'data/nigeria_exposure.csv'
-            df_csv = df.drop(columns='geometry') if 'geometry' in df.columns else df
-            df_csv.to_csv(csv_file, index=False)
+            write_csv(df, csv_file, columns=point_cols)
             file_size = Path(csv_file).stat().st_size / (1024*1024)
             logger.info(f"Saved CSV: {csv_file} ({file_size:.1f} MB)")
         
-        if save_format in ['hdf5', 'both']:
-            # Save as HDF5 (faster loading, compressed)
-            hdf5_file = 'data/nigeria_exposure.hdf5'
-            exposure.write_hdf5(hdf5_file)
-            file_size = Path(hdf5_file).stat().st_size / (1024*1024)
-            logger.info(f"Saved HDF5: {hdf5_file} ({file_size:.1f} MB)")
-        
         # Print summary statistics
         print_exposure_summary(df)
         
@@ -122,47 +161,57 @@ def aggregate_exposure_by_lga(exposure_df, lga_boundaries_file='data/nigeria_lga
     print("="*70)
     
     try:
-        # Load LGA boundaries
-        logger.info(f"Loading LGA boundaries from {lga_boundaries_file}...")
-        lga_gdf = gpd.read_file(lga_boundaries_file)
+        # Load LGA boundaries (from a binary GeoParquet cache when up to date)
+        lga_gdf = _load_lga_boundaries(lga_boundaries_file)
         logger.info(f"Loaded {len(lga_gdf)} LGAs")
         
-        # Convert exposure to GeoDataFrame if not already
-        if 'geometry' not in exposure_df.columns:
-            from shapely.geometry import Point
+        # LGA key column as a contiguous array, reused to align the statistics
+        lga_names = lga_gdf['lga_name'].to_numpy()
+        
+        # Convert exposure to GeoDataFrame if not already (without copying the rows)
+        if isinstance(exposure_df, gpd.GeoDataFrame):
+            exposure_gdf = exposure_df if exposure_df.crs else exposure_df.set_crs('EPSG:4326')
+        elif 'geometry' not in exposure_df.columns:
             logger.info("Converting exposure points to GeoDataFrame...")
-            geometry = [Point(lon, lat) for lon, lat in zip(exposure_df['lon'], exposure_df['lat'])]
-            exposure_gdf = gpd.GeoDataFrame(exposure_df, geometry=geometry, crs='EPSG:4326')
+            # Vectorized constructor - avoids one Python Point object per row
+            geometry = gpd.points_from_xy(
+                exposure_df['lon'].to_numpy(), exposure_df['lat'].to_numpy(), crs='EPSG:4326'
+            )
+            exposure_gdf = gpd.GeoDataFrame(exposure_df, geometry=geometry, crs='EPSG:4326', copy=False)
         else:
-            exposure_gdf = gpd.GeoDataFrame(exposure_df, crs='EPSG:4326')
+            exposure_gdf = gpd.GeoDataFrame(exposure_df, crs='EPSG:4326', copy=False)
         
         # Ensure both have same CRS
         if lga_gdf.crs != exposure_gdf.crs:
             lga_gdf = lga_gdf.to_crs(exposure_gdf.crs)
         
+        # Build the LGA spatial index up front (the ~774 polygons are the tree side)
+        _ = lga_gdf.sindex
+        
         # Spatial join - assign each exposure point to an LGA
+        # For points 'intersects' matches 'within' but is cheaper to evaluate in GEOS
         logger.info("Performing spatial join (this may take a few minutes)...")
-        joined = gpd.sjoin(exposure_gdf, lga_gdf, how='left', predicate='within')
+        joined = gpd.sjoin(exposure_gdf, lga_gdf, how='left', predicate='intersects')
+        
+        # A point on a shared boundary intersects both LGAs - count it only once
+        joined = joined[~joined.index.duplicated(keep='first')]
         
         # Aggregate by LGA
         logger.info("Aggregating statistics by LGA...")
         
         # Group by LGA and calculate statistics
-        agg_cols = {}
-        if 'exposure_value_usd' in joined.columns:
-            agg_cols['exposure_value_usd'] = ['sum', 'mean', 'count']
+        lga_stats = _aggregate_lga_stats(joined)
         
-        lga_stats = joined.groupby('lga_name').agg(agg_cols)
-        lga_stats.columns = ['_'.join(col).strip() for col in lga_stats.columns.values]
-        lga_stats = lga_stats.reset_index()
-        
-        # Merge with LGA geometries
-        lga_exposure = lga_gdf.merge(lga_stats, on='lga_name', how='left')
+        # Align statistics to the LGA rows by name and attach them column-wise
+        # (same result as a left merge, without re-hashing the geometry frame)
+        lga_stats = lga_stats.set_index('lga_name').reindex(lga_names)
+        lga_exposure = lga_gdf.assign(**{
+            col: lga_stats[col].to_numpy() for col in lga_stats.columns
+        })
         
         # Fill NaN with 0 for LGAs with no exposure points
-        for col in lga_exposure.columns:
-            if 'exposure' in col and lga_exposure[col].dtype in [np.float64, np.int64]:
-                lga_exposure[col] = lga_exposure[col].fillna(0)
+        fill_cols = lga_exposure.filter(like='exposure').select_dtypes(include='number').columns
+        lga_exposure[fill_cols] = lga_exposure[fill_cols].fillna(0)
         
         # Rename columns
         lga_exposure = lga_exposure.rename(columns={
@@ -171,15 +220,23 @@ def aggregate_exposure_by_lga(exposure_df, lga_boundaries_file='data/nigeria_lga
             'exposure_value_usd_count': 'n_exposure_points'
         })
         
-        # Save
-        output_file = 'data/nigeria_exposure_by_lga.geojson'
-        lga_exposure.to_file(output_file, driver='GeoJSON')
+        # Save as GeoParquet (binary WKB geometry, compressed columns)
+        output_file = 'data/nigeria_exposure_by_lga.parquet'
+        lga_exposure.to_parquet(output_file, compression='zstd', geometry_encoding='WKB')
         file_size = Path(output_file).stat().st_size / (1024*1024)
         logger.info(f"Saved LGA aggregation: {output_file} ({file_size:.1f} MB)")
         
+        # Lightweight GeoJSON with simplified boundaries for map viewers
+        # (own file name - the full-resolution geometry lives in the GeoParquet)
+        viewer_file = 'data/nigeria_exposure_by_lga_simplified.geojson'
+        lga_exposure.assign(geometry=lga_exposure.geometry.simplify(0.01)).to_file(
+            viewer_file, driver='GeoJSON'
+        )
+        logger.info(f"Saved simplified GeoJSON: {viewer_file}")
+        
         # Also save CSV
         csv_file = 'data/nigeria_exposure_by_lga.csv'
-        lga_exposure.drop(columns='geometry').to_csv(csv_file, index=False)
+        write_csv(pd.DataFrame(lga_exposure.drop(columns='geometry')), csv_file)
         
         # Print summary
         print_lga_exposure_summary(lga_exposure)
@@ -193,6 +250,64 @@ def aggregate_exposure_by_lga(exposure_df, lga_boundaries_file='data/nigeria_lga
         return None
 
 
+def _load_lga_boundaries(lga_boundaries_file):
+    """
+    Load LGA boundaries, caching them as GeoParquet next to the source file
+    
+    Parsing the GeoJSON is the slow part of every aggregation run; the
+    cache is rebuilt whenever the source file is newer than it.
+    """
+    source = Path(lga_boundaries_file)
+    cache = source.with_suffix('.parquet')
+    
+    if cache.exists() and cache.stat().st_mtime >= source.stat().st_mtime:
+        logger.info(f"Loading LGA boundaries from cache {cache}...")
+        return gpd.read_parquet(cache)
+    
+    logger.info(f"Loading LGA boundaries from {source}...")
+    lga_gdf = gpd.read_file(source)
+    try:
+        lga_gdf.to_parquet(cache, compression='zstd')
+    except ImportError:
+        logger.warning("Install pyarrow to cache LGA boundaries: pip install pyarrow")
+    return lga_gdf
+
+
+def _aggregate_lga_stats(joined):
+    """
+    Sum/mean/count exposure per LGA
+    
+    Uses Arrow's single-pass hash aggregation when pyarrow is installed,
+    falling back to a pandas groupby otherwise.
+    
+    Args:
+        joined: Exposure points joined to LGAs (lga_name, exposure_value_usd)
+    
+    Returns:
+        DataFrame with lga_name and exposure_value_usd_{sum,mean,count}
+    """
+    if 'exposure_value_usd' not in joined.columns:
+        return joined[['lga_name']].dropna().drop_duplicates()
+    
+    # Points outside every LGA have no lga_name
+    joined = joined.loc[joined['lga_name'].notna(), ['lga_name', 'exposure_value_usd']]
+    
+    try:
+        import pyarrow as pa
+    except ImportError:
+        lga_stats = joined.groupby('lga_name').agg({'exposure_value_usd': ['sum', 'mean', 'count']})
+        lga_stats.columns = ['_'.join(col).strip() for col in lga_stats.columns.values]
+        return lga_stats.reset_index()
+    
+    table = pa.Table.from_pandas(pd.DataFrame(joined), preserve_index=False)
+    lga_stats = table.group_by('lga_name').aggregate([
+        ('exposure_value_usd', 'sum'),
+        ('exposure_value_usd', 'mean'),
+        ('exposure_value_usd', 'count')
+    ])
+    return lga_stats.to_pandas()
+
+
 def download_worldpop_data(year=2020, output_file='data/nigeria_population_worldpop.tif'):
     """
     Download population raster from WorldPop
@@ -220,25 +335,31 @@ def download_worldpop_data(year=2020, output_file='data/nigeria_population_world
     logger.info("File size: ~50 MB, may take 5-10 minutes...")
     
     try:
-        response = requests.get(url, stream=True, timeout=300)
+        # Keep-alive session so further tile downloads can reuse the connection
+        session = requests.Session()
+        response = session.get(url, stream=True, timeout=300)
         response.raise_for_status()
         
         Path(output_file).parent.mkdir(exist_ok=True)
         
-        # Download with progress
+        # Stream socket -> file in 8 MB blocks without a Python-level loop
         total_size = int(response.headers.get('content-length', 0))
-        block_size = 1024 * 1024  # 1 MB
-        downloaded = 0
+        block_size = 8 * 1024 * 1024  # 8 MB
+        response.raw.decode_content = True
+        
+        try:
+            from tqdm import tqdm
+        except ImportError:
+            tqdm = None  # Download without a progress bar
         
         with open(output_file, 'wb') as f:
-            for data in response.iter_content(block_size):
-                downloaded += len(data)
-                f.write(data)
-                if total_size:
-                    progress = (downloaded / total_size) * 100
-                    print(f"Progress: {progress:.1f}% ({downloaded/(1024*1024):.1f} MB)", end='\r')
-        
-        print()  # New line after progress
+            if tqdm is not None:
+                with tqdm.wrapattr(response.raw, 'read', total=total_size or None,
+                                   desc='Progress') as raw:
+                    shutil.copyfileobj(raw, f, length=block_size)
+            else:
+                shutil.copyfileobj(response.raw, f, length=block_size)
+        
         logger.info(f"Downloaded: {output_file}")
         
         # Verify with rasterio
@@ -260,6 +381,66 @@ def download_worldpop_data(year=2020, output_file='data/nigeria_population_world
         return None
 
 
+def _sample_raster_windowed(src, lon, lat, window_size=4096):
+    """
+    Sample band 1 of an open raster at many points, one window at a time
+    
+    Point pixel indices are computed in one vectorized step, points are
+    grouped by the window they fall in, and each window is read once and
+    indexed. Peak memory stays at one window (~64 MB for 4096x4096
+    float32) however large the raster is, e.g. 100 m WorldPop.
+    
+    Args:
+        src: Open rasterio dataset
+        lon, lat: Point coordinates in the raster CRS
+        window_size: Window edge length in pixels
+    
+    Returns:
+        float64 array of values; points outside the raster, nodata and
+        non-positive cells are 0
+    """
+    from rasterio.windows import Window
+    
+    lon = np.asarray(lon)
+    lat = np.asarray(lat)
+    cols, rows = ~src.transform * (lon, lat)
+    rows = np.floor(rows).astype(np.int64)
+    cols = np.floor(cols).astype(np.int64)
+    
+    population = np.zeros(len(lon), dtype=np.float64)
+    
+    inside = np.flatnonzero(
+        (rows >= 0) & (rows < src.height) & (cols >= 0) & (cols < src.width)
+    )
+    if len(inside) == 0:
+        return population
+    
+    # Sort points by window so each window is read exactly once
+    n_window_cols = -(-src.width // window_size)
+    window_id = (rows[inside] // window_size) * n_window_cols + cols[inside] // window_size
+    order = np.argsort(window_id, kind='stable')
+    inside = inside[order]
+    window_id = window_id[order]
+    
+    ids, starts = np.unique(window_id, return_index=True)
+    ends = np.append(starts[1:], len(inside))
+    
+    for wid, start, end in zip(ids, starts, ends):
+        row_off = (wid // n_window_cols) * window_size
+        col_off = (wid % n_window_cols) * window_size
+        window = Window(
+            col_off, row_off,
+            min(window_size, src.width - col_off),
+            min(window_size, src.height - row_off)
+        )
+        block = src.read(1, window=window)
+        
+        idx = inside[start:end]
+        population[idx] = block[rows[idx] - row_off, cols[idx] - col_off]
+    
+    return np.where(population > 0, population, 0)
+
+
 def create_exposure_from_population_raster(
     raster_file,
     centroids_file='data/nigeria_centroids_1km.hdf5',
@@ -292,36 +473,40 @@ def create_exposure_from_population_raster(
         
         # Load population raster
         logger.info(f"Loading population raster from {raster_file}...")
-        with rasterio.open(raster_file) as src:
-            # Sample population at each centroid
-            coords = [(lon, lat) for lon, lat in zip(centroids.lon, centroids.lat)]
-            population = np.array([val[0] if val[0] > 0 else 0 for val in src.sample(coords)])
+        # Larger GDAL block cache for the windowed reads
+        with rasterio.Env(GDAL_CACHEMAX=500), rasterio.open(raster_file) as src:
+            population = _sample_raster_windowed(src, centroids.lon, centroids.lat)
         
         logger.info(f"Sampled population for {len(population):,} points")
         
+        # Drop zero-population points before computing exposure, so the
+        # multiply and the DataFrame build only touch populated points
+        populated = np.flatnonzero(population > 0)
+        population = population[populated]
+        
         # Calculate exposure (population × GDP per capita)
         exposure_value = population * gdp_per_capita
         
-        # Create DataFrame
+        # Create DataFrame (constant text columns as single-entry categoricals)
+        n = len(populated)
         df = pd.DataFrame({
-            'lat': centroids.lat,
-            'lon': centroids.lon,
+            'lat': np.asarray(centroids.lat)[populated],
+            'lon': np.asarray(centroids.lon)[populated],
             'population': population,
-            'gdp_per_capita_usd': gdp_per_capita,
+            'gdp_per_capita_usd': np.full(n, gdp_per_capita, dtype=np.float32),
             'exposure_value_usd': exposure_value,
-            'exposure_type': 'population_gdp',
-            'data_source': 'WorldPop',
-            'generated_date': datetime.now().strftime('%Y-%m-%d')
+            'exposure_type': _constant_column('population_gdp', n),
+            'data_source': _constant_column('WorldPop', n),
+            'generated_date': _constant_column(datetime.now().strftime('%Y-%m-%d'), n)
         })
         
-        # Remove zero-population points
-        df = df[df['population'] > 0].reset_index(drop=True)
-        
         logger.info(f"Created exposure for {len(df):,} populated points")
         
+        df = _downcast_exposure(df)
+        
         # Save
         output_file = 'data/nigeria_exposure.csv'
-        df.to_csv(output_file, index=False)
+        write_csv(df, output_file)
         file_size = Path(output_file).stat().st_size / (1024*1024)
         logger.info(f"Saved: {output_file} ({file_size:.1f} MB)")
         
@@ -400,16 +585,35 @@ def print_lga_exposure_summary(gdf):
         print(f"   LGAs with exposure:  {lgas_with_data}")
         print(f"   LGAs with no data:   {len(gdf) - lgas_with_data}")
         
+        summary = pd.DataFrame(gdf[['lga_name', 'state_name', 'total_exposure_usd']])
+        
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            total = summary['total_exposure_usd'].sum()
+            mean = summary['total_exposure_usd'].mean()
+            median = summary['total_exposure_usd'].median()
+            top10 = summary.nlargest(10, 'total_exposure_usd')
+        else:
+            # Stats and the top-10 straight from Arrow - no pandas sort/index roundtrip
+            table = pa.Table.from_pandas(summary, preserve_index=False)
+            values = table['total_exposure_usd']
+            total = pc.sum(values).as_py()
+            mean = pc.mean(values).as_py()
+            median = pc.quantile(values, q=0.5)[0].as_py()
+            order = pc.sort_indices(table, sort_keys=[('total_exposure_usd', 'descending')])
+            top10 = table.take(order[:10]).to_pandas()
+        
         print(f"\n💰 Exposure Statistics:")
-        print(f"   Total exposure:      ${gdf['total_exposure_usd'].sum():,.0f}")
-        print(f"   Mean per LGA:        ${gdf['total_exposure_usd'].mean():,.0f}")
-        print(f"   Median per LGA:      ${gdf['total_exposure_usd'].median():,.0f}")
+        print(f"   Total exposure:      ${total:,.0f}")
+        print(f"   Mean per LGA:        ${mean:,.0f}")
+        print(f"   Median per LGA:      ${median:,.0f}")
         
         # Top 10 LGAs by exposure
         print(f"\n🏆 Top 10 LGAs by Exposure:")
-        top10 = gdf.nlargest(10, 'total_exposure_usd')[['lga_name', 'state_name', 'total_exposure_usd']]
-        for idx, row in top10.iterrows():
-            print(f"   {row['lga_name']:25s} ({row['state_name']:15s}) ${row['total_exposure_usd']:,.0f}")
+        for name, state, value in top10.itertuples(index=False, name=None):
+            print(f"   {name:25s} ({state:15s}) ${value:,.0f}")
     
     print("="*70)
 
@@ -444,9 +648,11 @@ Examples:
 
 Output:
   Creates in data/ directory:
-  - nigeria_exposure.csv (point-level exposure)
-  - nigeria_exposure.hdf5 (HDF5 format, optional)
-  - nigeria_exposure_by_lga.geojson (LGA-aggregated)
+  - nigeria_exposure.parquet (point-level exposure, LitPop)
+  - nigeria_exposure.csv (point-level exposure, WorldPop or --format csv/both)
+  - nigeria_exposure.hdf5 (HDF5 format, --format hdf5/both)
+  - nigeria_exposure_by_lga.parquet (LGA-aggregated, GeoParquet)
+  - nigeria_exposure_by_lga_simplified.geojson (LGA-aggregated, simplified for viewers)
   - nigeria_exposure_by_lga.csv (LGA-aggregated, no geometry)
         """
     )
@@ -465,6 +671,14 @@ Output:
         help='Resolution in arc seconds (30≈1km, 150≈5km, 300≈10km)'
     )
     
+    parser.add_argument(
+        '--format',
+        choices=['csv', 'hdf5', 'both', 'parquet'],
+        default='both',
+        help='LitPop output: csv, hdf5, both (CSV + HDF5) or parquet only; '
+             'the Parquet file is written in every case'
+    )
+    
     parser.add_argument(
         '--aggregate-lga',
         action='store_true',
@@ -487,7 +701,7 @@ Output:
             # Generate using CLIMADA LitPop
             exposure_df = generate_exposure_litpop(
                 resolution_arcsec=args.resolution,
-                save_format='both'
+                save_format=args.format
             )
         
         elif args.method == 'worldpop':
@@ -510,7 +724,10 @@ Output:
                 print(f"   {f.name:45s} {size:6.1f} MB")
             
             print("\nNext steps:")
-            print("1. Verify: python -c \"import pandas as pd; df = pd.read_csv('data/nigeria_exposure.csv'); print(f'Loaded {len(df):,} points')\"")
+            if args.method == 'litpop':
+                print("1. Verify: python -c \"import pandas as pd; df = pd.read_parquet('data/nigeria_exposure.parquet'); print(f'Loaded {len(df):,} points')\"")
+            else:
+                print("1. Verify: python -c \"import pandas as pd; df = pd.read_csv('data/nigeria_exposure.csv'); print(f'Loaded {len(df):,} points')\"")
             print("2. Aggregate to LGA: python generate_exposure.py --aggregate-lga")
             print("3. Use in forecasts!")
             print("="*70)
@@ -9,6 +9,7 @@ Requirements:
 - WorldPop Nigeria population raster (nga_ppp_2020_1km_Aggregated.tif)
 - Nigeria LGA boundaries shapefile
 - CLIMADA, rasterio, geopandas, rasterstats
+- numba (optional, parallel zonal sums)
 
 Usage:
     python generate_exposure_lga.py
@@ -18,11 +19,15 @@ Usage:
 import os
 import sys
 import logging
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import numpy as np
 import pandas as pd
 import geopandas as gpd
-from shapely.geometry import Point, mapping
+import shapely
+from shapely.geometry import Point
 import warnings
 
 warnings.filterwarnings('ignore')
@@ -34,6 +39,43 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# GDAL settings for the raster reads: a 1 GB block cache so overlapping
+# windows/masks are served from memory, and multi-threaded decompression
+GDAL_ENV = {'GDAL_CACHEMAX': 1024, 'GDAL_NUM_THREADS': 'ALL_CPUS'}
+
+# Optional: numba kernel for the zonal sums (falls back to np.bincount)
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _zonal_sum_kernel(labels, pop, n_bins):
+        """
+        Per-label population sums in one parallel pass over the raster.
+        
+        Each thread accumulates a band of rows into its own bin array, so
+        no float64 copy of the population band is needed. Nodata (negative)
+        and NaN cells fail the > 0 test and are skipped.
+        """
+        n_rows, n_cols = labels.shape
+        n_threads = numba.get_num_threads()
+        rows_per_thread = (n_rows + n_threads - 1) // n_threads
+        partial = np.zeros((n_threads, n_bins), dtype=np.float64)
+        
+        for t in numba.prange(n_threads):
+            for r in range(t * rows_per_thread, min((t + 1) * rows_per_thread, n_rows)):
+                for c in range(n_cols):
+                    value = pop[r, c]
+                    if value > 0:
+                        partial[t, labels[r, c]] += value
+        
+        return partial.sum(axis=0)
+else:
+    _zonal_sum_kernel = None
+
 
 def download_nigeria_boundaries():
     """
@@ -135,11 +177,345 @@ def load_lga_boundaries(lga_shapefile=None):
         raise
 
 
+def ensure_cog(worldpop_file, blocksize=256):
+    """
+    Return a tiled (Cloud-Optimized) copy of the WorldPop raster.
+    
+    WorldPop ships stripped GeoTIFFs, where every windowed or masked read
+    pulls whole rows of the raster. A stripped input is rewritten once as a
+    256x256-tiled, deflate-compressed COG next to the source and reused on
+    later runs. Already tiled inputs are returned unchanged.
+    
+    Parameters
+    ----------
+    worldpop_file : str or Path
+        Path to WorldPop .tif file
+    blocksize : int
+        Internal tile size of the COG
+    
+    Returns
+    -------
+    Path
+        Raster to read from (the COG, or the original file)
+    """
+    import rasterio
+    
+    worldpop_file = Path(worldpop_file)
+    
+    with rasterio.open(worldpop_file) as src:
+        if src.profile.get('tiled', False):
+            return worldpop_file
+    
+    cog_file = worldpop_file.with_name(f"{worldpop_file.stem}_cog.tif")
+    if cog_file.exists() and cog_file.stat().st_mtime >= worldpop_file.stat().st_mtime:
+        logger.info(f"Using tiled copy: {cog_file}")
+        return cog_file
+    
+    logger.info(f"Input raster is not tiled - writing COG to {cog_file}...")
+    try:
+        try:
+            from rio_cogeo.cogeo import cog_translate
+            from rio_cogeo.profiles import cog_profiles
+            
+            profile = cog_profiles.get('deflate')
+            profile.update(blockxsize=blocksize, blockysize=blocksize)
+            cog_translate(worldpop_file, cog_file, profile, quiet=True)
+        except ImportError:
+            # GDAL's own COG driver when rio-cogeo is not installed
+            from rasterio.shutil import copy as rio_copy
+            rio_copy(worldpop_file, cog_file, driver='COG', blocksize=blocksize, compress='DEFLATE')
+    except Exception as e:
+        logger.warning(f"Could not write COG ({e}) - reading the original raster")
+        return worldpop_file
+    
+    return cog_file
+
+
+def _lga_window(src, lgas):
+    """
+    Pixel window of ``src`` covering the LGA union bounds.
+    
+    Returns
+    -------
+    rasterio.windows.Window or None
+        Whole-pixel window clipped to the raster, or None if the LGAs do
+        not overlap the raster at all
+    """
+    from rasterio.windows import Window, from_bounds
+    
+    bounds = from_bounds(*lgas.total_bounds, transform=src.transform)
+    
+    # Widen to whole pixels so edge pixels are not cut off, then clip
+    col_start = max(int(np.floor(bounds.col_off)), 0)
+    row_start = max(int(np.floor(bounds.row_off)), 0)
+    col_stop = min(int(np.ceil(bounds.col_off + bounds.width)), src.width)
+    row_stop = min(int(np.ceil(bounds.row_off + bounds.height)), src.height)
+    
+    if col_stop <= col_start or row_stop <= row_start:
+        return None
+    
+    return Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+
+
+def _accumulate_zonal_sums(sums, labels, pop, backend='auto'):
+    """
+    Add the population of one block to the per-label sums (in place).
+    
+    backend 'auto' uses the numba kernel when numba is installed and
+    np.bincount otherwise; 'scipy' uses scipy.ndimage.sum_labels. All
+    three drop nodata (negative) and NaN cells.
+    """
+    if backend == 'scipy':
+        from scipy import ndimage
+        
+        # Zero out nodata/NaN cells; label 0 (outside all LGAs) is summed too
+        values = np.where(pop > 0, pop, 0)
+        sums += ndimage.sum_labels(values, labels, index=np.arange(len(sums)))
+    elif _zonal_sum_kernel is not None:
+        sums += _zonal_sum_kernel(labels, pop, len(sums))
+    else:
+        # Nodata (negative) and NaN cells fail the > 0 test and are dropped
+        valid = pop > 0
+        sums += np.bincount(
+            labels[valid],
+            weights=pop[valid].astype(np.float64),
+            minlength=len(sums)
+        )
+
+
+def _lga_label_cache_file(src, lgas, window):
+    """
+    Cache path for the LGA label raster of ``lgas`` over ``window`` of ``src``.
+    
+    The key hashes the LGA geometries (WKB) together with the window's
+    transform and shape, so any change to the boundaries or the grid gives
+    a new file.
+    """
+    key = hashlib.sha1()
+    for wkb in shapely.to_wkb(np.asarray(lgas.geometry.values)):
+        key.update(wkb if wkb is not None else b'\0')
+    key.update(repr((tuple(src.window_transform(window))[:6], int(window.height), int(window.width))).encode())
+    
+    raster = Path(src.name)
+    return raster.with_name(f"{raster.stem}_lga_labels_{key.hexdigest()[:16]}.npy")
+
+
+def _load_or_rasterize_labels(src, lgas, window):
+    """
+    LGA label raster for ``window`` of ``src``, memory-mapped from a cache.
+    
+    On a cache miss the labels are rasterized straight into a new .npy
+    memmap next to the raster, so later runs against the same grid and
+    boundaries skip rasterization. If that directory is not writable the
+    labels are rasterized in memory instead.
+    
+    Returns
+    -------
+    numpy.ndarray
+        int32 labels (LGA row + 1, 0 = outside all LGAs)
+    """
+    from rasterio.features import rasterize
+    
+    cache_file = _lga_label_cache_file(src, lgas, window)
+    if cache_file.exists():
+        logger.info(f"Using cached LGA label raster: {cache_file}")
+        return np.load(cache_file, mmap_mode='r')
+    
+    shapes = (
+        (geom, i + 1) for i, geom in enumerate(lgas.geometry)
+        if geom is not None and not geom.is_empty
+    )
+    out_shape = (int(window.height), int(window.width))
+    transform = src.window_transform(window)
+    
+    # Written under a temporary name so an interrupted run never leaves a
+    # truncated cache behind
+    tmp_file = cache_file.with_name(f"{cache_file.stem}.tmp.npy")
+    try:
+        labels = np.lib.format.open_memmap(tmp_file, mode='w+', dtype='int32', shape=out_shape)
+    except OSError as e:
+        logger.warning(f"Could not cache LGA labels ({e}) - rasterizing in memory")
+        return rasterize(shapes, out_shape=out_shape, transform=transform, fill=0, dtype='int32')
+    
+    rasterize(shapes, out=labels, transform=transform, all_touched=False)
+    labels.flush()
+    del labels
+    os.replace(tmp_file, cache_file)
+    logger.info(f"Cached LGA label raster: {cache_file}")
+    
+    return np.load(cache_file, mmap_mode='r')
+
+
+def _zonal_sums_rasterize(src, lgas, backend='auto'):
+    """
+    Population sum per LGA from a single label raster.
+    
+    Every LGA is burnt into an int32 label array covering the LGA union
+    bounds (0 = outside all LGAs), cached on disk and memory-mapped. The
+    population band is then streamed block by block over that window and
+    each block is added to the per-LGA sums, so only one raster block is
+    held in memory at a time.
+    
+    Parameters
+    ----------
+    src : rasterio.DatasetReader
+        Open WorldPop raster
+    lgas : geopandas.GeoDataFrame
+        LGA boundaries in the raster CRS
+    backend : str
+        'auto' (numba kernel, or np.bincount without numba) or 'scipy'
+        (scipy.ndimage.sum_labels)
+    
+    Returns
+    -------
+    numpy.ndarray
+        float64 population sum for each row of ``lgas``
+    """
+    from rasterio.errors import WindowError
+    
+    # Only the part of the raster covered by the LGAs is labelled and read
+    window = _lga_window(src, lgas)
+    if window is None:
+        return np.zeros(len(lgas), dtype=np.float64)
+    
+    labels = _load_or_rasterize_labels(src, lgas, window)
+    
+    sums = np.zeros(len(lgas) + 1, dtype=np.float64)
+    
+    for _, block in src.block_windows(1):
+        try:
+            block = block.intersection(window)
+        except WindowError:
+            continue  # Block lies outside the LGA window
+        
+        pop = src.read(1, window=block)
+        
+        # Matching slice of the label array
+        row = int(block.row_off - window.row_off)
+        col = int(block.col_off - window.col_off)
+        block_labels = np.asarray(labels[row:row + pop.shape[0], col:col + pop.shape[1]])
+        
+        _accumulate_zonal_sums(sums, block_labels, pop, backend=backend)
+    
+    return sums[1:]
+
+
+def _zonal_sums_mask_chunk(worldpop_file, lga_chunk):
+    """
+    Worker: population sums for a chunk of LGAs, masking the raster once per LGA.
+    
+    Opens its own dataset handle - GDAL handles cannot be shared between
+    processes.
+    """
+    import rasterio
+    from rasterio.mask import mask
+    
+    sums = np.zeros(len(lga_chunk), dtype=np.float64)
+    
+    with rasterio.Env(**GDAL_ENV), rasterio.open(worldpop_file) as src:
+        for idx, lga in lga_chunk.reset_index(drop=True).iterrows():
+            try:
+                # Get LGA geometry (rasterio reads its __geo_interface__ directly)
+                geom = [lga.geometry]
+                
+                # Mask raster with LGA boundary
+                out_image, out_transform = mask(src, geom, crop=True, nodata=src.nodata)
+                
+                # Sum population in LGA
+                sums[idx] = out_image[out_image > 0].sum()
+                
+            except Exception as e:
+                logger.warning(f"  Could not process LGA {lga.get('lga_name', idx)}: {e}")
+                continue
+    
+    return sums
+
+
+def _zonal_sums_mask(worldpop_file, lgas, n_jobs=None):
+    """
+    Population sum per LGA, masking the raster once per LGA.
+    
+    The LGAs are split into ``n_jobs`` chunks that are masked in parallel
+    worker processes.
+    
+    Parameters
+    ----------
+    worldpop_file : str or Path
+        Path to WorldPop .tif file
+    lgas : geopandas.GeoDataFrame
+        LGA boundaries in the raster CRS
+    n_jobs : int, optional
+        Number of worker processes (default: all CPUs)
+    
+    Returns
+    -------
+    numpy.ndarray
+        Population sum for each row of ``lgas`` (0 where masking failed)
+    """
+    n_jobs = max(1, min(n_jobs or os.cpu_count(), len(lgas)))
+    logger.info(f"Masking {len(lgas)} LGAs in {n_jobs} worker processes...")
+    
+    # A few chunks per worker keeps the pool balanced and the progress granular
+    chunks = [
+        chunk for chunk in np.array_split(np.arange(len(lgas)), n_jobs * 4)
+        if len(chunk) > 0
+    ]
+    results = [None] * len(chunks)
+    
+    try:
+        from tqdm import tqdm
+    except ImportError:
+        tqdm = None  # Log progress per chunk instead
+    progress = tqdm(total=len(lgas), unit='LGA', mininterval=1.0) if tqdm is not None else None
+    done = 0
+    
+    # 'spawn' avoids forking a process that already holds GEOS/GDAL threads
+    with ProcessPoolExecutor(
+        max_workers=n_jobs,
+        mp_context=multiprocessing.get_context('spawn')
+    ) as pool:
+        futures = {
+            pool.submit(_zonal_sums_mask_chunk, str(worldpop_file), lgas.iloc[chunk]): i
+            for i, chunk in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            done += len(chunks[i])
+            if progress is not None:
+                progress.update(len(chunks[i]))
+            else:
+                logger.info(f"  Processed {done}/{len(lgas)} LGAs...")
+    
+    if progress is not None:
+        progress.close()
+    
+    return np.concatenate(results)
+
+
+def _top_k(df, column, k):
+    """
+    The ``k`` rows with the largest ``column``, in descending order.
+    
+    np.argpartition selects the top ``k`` in O(n); only those ``k`` rows
+    are then sorted.
+    """
+    values = df[column].to_numpy()
+    if len(values) > k:
+        candidates = np.argpartition(-values, k)[:k]
+    else:
+        candidates = np.arange(len(values))
+    order = candidates[np.argsort(-values[candidates], kind='stable')]
+    return df.iloc[order]
+
+
 def generate_lga_exposure(
     worldpop_file=None,
     lga_shapefile=None,
     output_dir='data/exposure',
-    min_population=0
+    min_population=0,
+    zonal_method='rasterize',
+    n_jobs=None
 ):
     """
     Generate CLIMADA exposure data aggregated by LGA.
@@ -154,6 +530,14 @@ def generate_lga_exposure(
         Directory to save output files
     min_population : float
         Minimum population threshold for LGA inclusion
+    zonal_method : str
+        'rasterize' (default) burns all LGAs into one label raster and sums
+        population in a single pass; 'scipy' does the same with
+        scipy.ndimage.sum_labels as the summing backend; 'mask' masks the
+        raster once per LGA (slower, but pixels of overlapping polygons
+        count towards each LGA)
+    n_jobs : int, optional
+        Worker processes for the 'mask' method (default: all CPUs)
     
     Returns
     -------
@@ -163,7 +547,6 @@ def generate_lga_exposure(
     
     try:
         import rasterio
-        from rasterio.mask import mask
         from climada.entity import Exposures
     except ImportError as e:
         logger.error(f"Required package not installed: {e}")
@@ -192,57 +575,48 @@ def generate_lga_exposure(
     # Load LGA boundaries
     lgas = load_lga_boundaries(lga_shapefile)
     
+    # Windowed/masked reads only touch the relevant tiles of a tiled raster
+    worldpop_file = ensure_cog(worldpop_file)
+    
     logger.info(f"Reading WorldPop data from: {worldpop_file}")
     logger.info(f"Processing {len(lgas)} LGAs...")
     
-    # Process each LGA
-    lga_data = []
-    
-    with rasterio.open(worldpop_file) as src:
+    # Sum population per LGA
+    with rasterio.Env(**GDAL_ENV), rasterio.open(worldpop_file) as src:
         logger.info(f"WorldPop raster CRS: {src.crs}")
         logger.info(f"WorldPop raster bounds: {src.bounds}")
         
-        for idx, lga in lgas.iterrows():
-            try:
-                # Get LGA geometry
-                geom = [mapping(lga.geometry)]
-                
-                # Mask raster with LGA boundary
-                out_image, out_transform = mask(src, geom, crop=True, nodata=src.nodata)
-                
-                # Sum population in LGA
-                population = out_image[out_image > 0].sum()
-                
-                if population > min_population:
-                    # Get LGA centroid for coordinates
-                    centroid = lga.geometry.centroid
-                    
-                    lga_data.append({
-                        'lga_name': lga['lga_name'],
-                        'latitude': centroid.y,
-                        'longitude': centroid.x,
-                        'value': float(population),
-                        'region_id': 566,  # Nigeria ISO code
-                        'geometry': lga.geometry
-                    })
-                    
-                    if (idx + 1) % 50 == 0:
-                        logger.info(f"  Processed {idx + 1}/{len(lgas)} LGAs...")
-                        
-            except Exception as e:
-                logger.warning(f"  Could not process LGA {lga.get('lga_name', idx)}: {e}")
-                continue
+        if zonal_method == 'mask':
+            population = _zonal_sums_mask(worldpop_file, lgas, n_jobs=n_jobs)
+        elif zonal_method == 'scipy':
+            population = _zonal_sums_rasterize(src, lgas, backend='scipy')
+        else:
+            population = _zonal_sums_rasterize(src, lgas)
+    
+    # LGA centroids in one vectorized call
+    centroids = lgas.geometry.centroid
+    cx = centroids.x.to_numpy()
+    cy = centroids.y.to_numpy()
+    
+    keep = np.flatnonzero(population > min_population)
     
     logger.info(f"✓ Processed all LGAs")
-    logger.info(f"Valid LGAs with population: {len(lga_data)}")
+    logger.info(f"Valid LGAs with population: {len(keep)}")
     
-    if len(lga_data) == 0:
+    if len(keep) == 0:
         logger.error("No LGAs with valid population data found!")
         sys.exit(1)
     
-    # Create GeoDataFrame
+    # Create GeoDataFrame straight from the column arrays
     logger.info("Creating CLIMADA Exposure object...")
-    gdf = gpd.GeoDataFrame(lga_data, crs='EPSG:4326')
+    gdf = gpd.GeoDataFrame({
+        'lga_name': lgas['lga_name'].to_numpy()[keep],
+        'latitude': cy[keep],
+        'longitude': cx[keep],
+        'value': population[keep],
+        'region_id': 566,  # Nigeria ISO code
+        'geometry': lgas.geometry.values[keep]
+    }, crs='EPSG:4326')
     
     # Create Exposures object
     exposure = Exposures(gdf)
@@ -288,6 +662,9 @@ def generate_lga_exposure(
     gdf.to_file(geojson_file, driver='GeoJSON')
     logger.info(f"✓ GeoJSON saved: {geojson_file}")
     
+    # Top LGAs by population (shared by the summary file and the log)
+    top10 = _top_k(gdf, 'value', 10)[['lga_name', 'value']]
+    
     # Save summary statistics
     stats_file = output_path / 'exposure_nigeria_lga_aggregated_summary.txt'
     with open(stats_file, 'w') as f:
@@ -311,7 +688,6 @@ def generate_lga_exposure(
         
         f.write("TOP 10 MOST POPULATED LGAs\n")
         f.write("-" * 70 + "\n")
-        top10 = gdf.nlargest(10, 'value')[['lga_name', 'value']]
         for i, row in top10.iterrows():
             f.write(f"{row['lga_name']:<40} {row['value']:>15,.0f}\n")
     
@@ -326,13 +702,89 @@ def generate_lga_exposure(
     logger.info(f"Total population: {gdf['value'].sum():,.0f}")
     logger.info(f"Mean population per LGA: {gdf['value'].mean():,.1f}")
     logger.info("\nTop 5 Most Populated LGAs:")
-    for i, row in gdf.nlargest(5, 'value').iterrows():
+    for i, row in top10.head(5).iterrows():
         logger.info(f"  {row['lga_name']}: {row['value']:,.0f}")
     logger.info("=" * 70)
     
     return exposure
 
 
+def preview_lga_exposure(worldpop_file=None, lga_shapefile=None, factor=4, top_n=5):
+    """
+    Quick, approximate LGA population totals from a downsampled read.
+    
+    The raster is read at 1/``factor`` resolution (GDAL serves this from
+    the internal overviews of a COG when present), so only ~1/factor² of
+    the cells are touched. Each coarse cell's average is scaled back to a
+    sum using the fraction of valid fine cells it covers, and the LGAs are
+    rasterized on the coarse grid. Good enough for a top-N preview; run
+    generate_lga_exposure for exact totals.
+    
+    Parameters
+    ----------
+    worldpop_file : str or Path, optional
+        Path to WorldPop .tif file
+    lga_shapefile : str or Path, optional
+        Path to LGA boundaries shapefile
+    factor : int
+        Downsampling factor per axis (4 = 4km cells for 1km WorldPop)
+    top_n : int
+        Number of LGAs to log
+    
+    Returns
+    -------
+    pandas.Series
+        Approximate population per LGA, indexed by lga_name
+    """
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.features import rasterize
+    
+    if worldpop_file is None:
+        worldpop_file = Path.home() / 'worldpop_data' / 'nga_ppp_2020_1km_Aggregated.tif'
+    
+    lgas = load_lga_boundaries(lga_shapefile)
+    
+    with rasterio.Env(**GDAL_ENV), rasterio.open(worldpop_file) as src:
+        window = _lga_window(src, lgas)
+        if window is None:
+            return pd.Series(0.0, index=lgas['lga_name'])
+        
+        out_shape = (-(-int(window.height) // factor), -(-int(window.width) // factor))
+        mean = src.read(1, window=window, out_shape=out_shape,
+                        resampling=Resampling.average, masked=True)
+        valid_fraction = src.read_masks(1, window=window, out_shape=out_shape,
+                                        resampling=Resampling.average) / 255.0
+        transform = src.window_transform(window) * rasterio.Affine.scale(
+            window.width / out_shape[1], window.height / out_shape[0]
+        )
+    
+    # Coarse-cell average x valid fine cells per coarse cell = coarse-cell sum
+    cells_per_pixel = (window.width * window.height) / (out_shape[0] * out_shape[1])
+    pop = mean.filled(0) * valid_fraction * cells_per_pixel
+    
+    labels = rasterize(
+        ((geom, i + 1) for i, geom in enumerate(lgas.geometry)
+         if geom is not None and not geom.is_empty),
+        out_shape=out_shape,
+        transform=transform,
+        fill=0,
+        dtype='int32'
+    )
+    sums = np.zeros(len(lgas) + 1, dtype=np.float64)
+    _accumulate_zonal_sums(sums, labels, pop)
+    
+    totals = pd.Series(sums[1:], index=lgas['lga_name'])
+    
+    logger.info(f"Preview at 1/{factor} resolution - approximate totals")
+    logger.info(f"Total population: {totals.sum():,.0f}")
+    logger.info(f"Top {top_n} Most Populated LGAs:")
+    for name, value in totals.nlargest(top_n).items():
+        logger.info(f"  {name}: ~{value:,.0f}")
+    
+    return totals
+
+
 def main():
     """Main entry point."""
     import argparse
@@ -365,15 +817,49 @@ def main():
         default=0,
         help='Minimum population threshold for LGA inclusion'
     )
+    parser.add_argument(
+        '--zonal-method',
+        choices=['rasterize', 'scipy', 'mask'],
+        default='rasterize',
+        help='Zonal sum method: single-pass label raster (numba/bincount or '
+             'scipy.ndimage backend), or one mask per LGA'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Worker processes for --zonal-method mask (default: all CPUs)'
+    )
+    parser.add_argument(
+        '--preview',
+        action='store_true',
+        help='Only log approximate LGA totals from a downsampled read (fast)'
+    )
+    parser.add_argument(
+        '--preview-factor',
+        type=int,
+        default=4,
+        help='Downsampling factor per axis for --preview'
+    )
     
     args = parser.parse_args()
     
+    if args.preview:
+        preview_lga_exposure(
+            worldpop_file=args.worldpop_file,
+            lga_shapefile=args.lga_shapefile,
+            factor=args.preview_factor
+        )
+        return 0
+    
     try:
         exposure = generate_lga_exposure(
             worldpop_file=args.worldpop_file,
             lga_shapefile=args.lga_shapefile,
             output_dir=args.output,
-            min_population=args.min_population
+            min_population=args.min_population,
+            zonal_method=args.zonal_method,
+            n_jobs=args.jobs
         )
         
         print("\n" + "🎉" * 35)
@@ -34,11 +34,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# GDAL settings for the raster read: a 1 GB block cache and
+# multi-threaded decompression
+GDAL_ENV = {'GDAL_CACHEMAX': 1024, 'GDAL_NUM_THREADS': 'ALL_CPUS'}
+
+def _points(lons, lats):
+    """
+    Point geometries for coordinate arrays.
+    
+    Uses Shapely 2's vectorized shapely.points (one GEOS call for all
+    cells); falls back to building Points one by one on Shapely 1.x.
+    """
+    try:
+        from shapely import points
+    except ImportError:
+        return [Point(lon, lat) for lon, lat in zip(lons, lats)]
+    return points(lons, lats)
+
+
+def _population_stats(population):
+    """
+    Summary statistics of the per-cell population in as few passes as possible.
+    
+    Min, max and all percentiles come from a single np.percentile call, and
+    the density bucket counts from a single np.histogram pass.
+    
+    Returns
+    -------
+    dict
+        count, total, mean, min, max, percentiles ({level: value}) and
+        density_counts (<50, 50-200, 200-500, >=500 people)
+    """
+    levels = [0, 10, 25, 50, 75, 90, 95, 99, 100]
+    values = np.percentile(population, levels)
+    density_counts, _ = np.histogram(population, bins=[-np.inf, 50, 200, 500, np.inf])
+    
+    count = len(population)
+    total = population.sum()
+    
+    return {
+        'count': count,
+        'total': total,
+        'mean': total / count,
+        'min': values[0],
+        'max': values[-1],
+        'percentiles': dict(zip(levels, values)),
+        'density_counts': density_counts
+    }
+
+
 def generate_exposure_worldpop(
     worldpop_file=None,
     output_dir='data/exposure',
     resolution_km=1,
-    min_population=0
+    min_population=0,
+    legacy_outputs=False
 ):
     """
     Generate CLIMADA exposure data from WorldPop population raster.
@@ -53,6 +103,9 @@ def generate_exposure_worldpop(
         Resolution in kilometers (WorldPop is 1km)
     min_population : float
         Minimum population threshold to include a grid cell
+    legacy_outputs : bool
+        Also write the CSV and (sampled) GeoJSON text outputs; by default
+        only HDF5, GeoParquet and the summary are written
     
     Returns
     -------
@@ -94,7 +147,7 @@ def generate_exposure_worldpop(
     
     # Read the raster data
     try:
-        with rasterio.open(worldpop_file) as src:
+        with rasterio.Env(**GDAL_ENV), rasterio.open(worldpop_file) as src:
             logger.info(f"Raster dimensions: {src.width} x {src.height}")
             logger.info(f"Raster CRS: {src.crs}")
             logger.info(f"Raster bounds: {src.bounds}")
@@ -106,19 +159,7 @@ def generate_exposure_worldpop(
             nodata = src.nodata
             bounds = src.bounds
             
-            # Get shape
-            height, width = population_data.shape
-            
-            # Create coordinate arrays
-            cols, rows = np.meshgrid(np.arange(width), np.arange(height))
-            
-            # Transform pixel coordinates to geographic coordinates
-            xs, ys = rasterio.transform.xy(transform, rows.flatten(), cols.flatten())
-            lons = np.array(xs)
-            lats = np.array(ys)
-            population = population_data.flatten()
-            
-            logger.info(f"Total cells in raster: {len(population):,}")
+            logger.info(f"Total cells in raster: {population_data.size:,}")
             
     except Exception as e:
         logger.error(f"Error reading WorldPop file: {e}")
@@ -127,16 +168,24 @@ def generate_exposure_worldpop(
     # Filter valid data
     logger.info("Filtering valid population data...")
     
-    # Create mask for valid data
-    if nodata is not None:
-        valid_mask = (population != nodata) & (population > min_population) & ~np.isnan(population)
-    else:
-        valid_mask = (population > min_population) & ~np.isnan(population)
+    # Create mask for valid data (on the 2-D grid - coordinates are only
+    # computed for the cells that pass)
+    population = population_data
+    # NaN fails the > comparison, so no separate isnan pass is needed, and
+    # nodata only needs its own test when it lies above the threshold
+    valid_mask = population > min_population
+    if nodata is not None and nodata > min_population:
+        valid_mask &= population != nodata
     
     # Apply mask
-    lons_valid = lons[valid_mask]
-    lats_valid = lats[valid_mask]
-    population_valid = population[valid_mask]
+    rows, cols = np.nonzero(valid_mask)
+    population_valid = population[rows, cols]
+    
+    # Pixel centres to geographic coordinates via the affine transform
+    # (same result as rasterio.transform.xy, without per-pixel Python lists)
+    # Coordinates are kept as float32 like the population band (~1e-6° precision)
+    lons_valid = (transform.c + (cols + 0.5) * transform.a + (rows + 0.5) * transform.b).astype(np.float32)
+    lats_valid = (transform.f + (cols + 0.5) * transform.d + (rows + 0.5) * transform.e).astype(np.float32)
     
     logger.info(f"Valid populated cells: {len(population_valid):,}")
     logger.info(f"Total population: {population_valid.sum():,.0f}")
@@ -155,7 +204,7 @@ def generate_exposure_worldpop(
     # Create GeoDataFrame
     logger.info("Creating CLIMADA Exposure object...")
     
-    geometry = [Point(lon, lat) for lon, lat in zip(lons_valid, lats_valid)]
+    geometry = _points(lons_valid, lats_valid)
     
     gdf = gpd.GeoDataFrame({
         'latitude': lats_valid,
@@ -186,8 +235,7 @@ def generate_exposure_worldpop(
     
     # Ensure geometry is set
     if 'geometry' not in exposure.gdf.columns or exposure.gdf.geometry.isna().any():
-        exposure.set_geometry([Point(lon, lat) for lon, lat in 
-                              zip(coords_data['lons'], coords_data['lats'])])
+        exposure.set_geometry(_points(coords_data['lons'], coords_data['lats']))
     
     # Check validity
     logger.info("Validating exposure data...")
@@ -215,49 +263,58 @@ def generate_exposure_worldpop(
         except Exception as e2:
             logger.warning(f"Could not save pickle: {e2}")
     
-    # Save as CSV for inspection (using original coordinates)
-    csv_file = output_path / f'exposure_nigeria_worldpop_{resolution_km}km.csv'
+    # Save as GeoParquet (columnar, compressed - the default point-level output)
+    parquet_file = output_path / f'exposure_nigeria_worldpop_{resolution_km}km.parquet'
     try:
-        csv_data = pd.DataFrame({
-            'latitude': coords_data['lats'],
-            'longitude': coords_data['lons'],
-            'value': coords_data['population'],
-            'region_id': 566
-        })
-        csv_data.to_csv(csv_file, index=False)
-        logger.info(f"✓ CSV saved: {csv_file}")
+        gdf[['latitude', 'longitude', 'value', 'region_id', 'geometry']].to_parquet(
+            parquet_file, compression='zstd'
+        )
+        logger.info(f"✓ Parquet saved: {parquet_file}")
     except Exception as e:
-        logger.warning(f"Could not save CSV: {e}")
-        # Try alternative method using exposure.gdf
-        try:
-            exposure.gdf.to_csv(csv_file, index=False)
-            logger.info(f"✓ CSV saved (alternative method): {csv_file}")
-        except:
-            pass
+        logger.warning(f"Could not save Parquet: {e}")
     
-    # Save GeoJSON for GIS software (sampled if too large)
-    geojson_file = output_path / f'exposure_nigeria_worldpop_{resolution_km}km.geojson'
-    try:
-        # Sample data if too large (>100k points)
-        if len(coords_data['lons']) > 100000:
-            sample_size = 100000
-            logger.info(f"Sampling {sample_size} points for GeoJSON (full data in CSV)")
-            indices = np.random.choice(len(coords_data['lons']), sample_size, replace=False)
-            
-            sample_gdf = gpd.GeoDataFrame({
-                'latitude': coords_data['lats'][indices],
-                'longitude': coords_data['lons'][indices],
-                'value': coords_data['population'][indices],
+    if legacy_outputs:
+        # Save as CSV for inspection (using original coordinates)
+        csv_file = output_path / f'exposure_nigeria_worldpop_{resolution_km}km.csv'
+        try:
+            csv_data = pd.DataFrame({
+                'latitude': coords_data['lats'],
+                'longitude': coords_data['lons'],
+                'value': coords_data['population'],
                 'region_id': 566
-            }, geometry=[Point(lon, lat) for lon, lat in 
-                        zip(coords_data['lons'][indices], coords_data['lats'][indices])],
-               crs='EPSG:4326')
-            sample_gdf.to_file(geojson_file, driver='GeoJSON')
-        else:
-            exposure.gdf.to_file(geojson_file, driver='GeoJSON')
-        logger.info(f"✓ GeoJSON saved: {geojson_file}")
-    except Exception as e:
-        logger.warning(f"Could not save GeoJSON: {e}")
+            })
+            csv_data.to_csv(csv_file, index=False)
+            logger.info(f"✓ CSV saved: {csv_file}")
+        except Exception as e:
+            logger.warning(f"Could not save CSV: {e}")
+            # Try alternative method using exposure.gdf
+            try:
+                exposure.gdf.to_csv(csv_file, index=False)
+                logger.info(f"✓ CSV saved (alternative method): {csv_file}")
+            except:
+                pass
+        
+        # Save GeoJSON for GIS software (sampled if too large)
+        geojson_file = output_path / f'exposure_nigeria_worldpop_{resolution_km}km.geojson'
+        try:
+            # Sample data if too large (>100k points)
+            if len(coords_data['lons']) > 100000:
+                sample_size = 100000
+                logger.info(f"Sampling {sample_size} points for GeoJSON (full data in Parquet/CSV)")
+                # Sorted so the sample keeps the raster's row order
+                indices = np.sort(np.random.choice(len(coords_data['lons']), sample_size, replace=False))
+                
+                # Reuse the already-built point geometries rather than rebuilding them
+                sample_gdf = gdf[['latitude', 'longitude', 'value', 'region_id', 'geometry']].iloc[indices]
+                sample_gdf.to_file(geojson_file, driver='GeoJSON')
+            else:
+                exposure.gdf.to_file(geojson_file, driver='GeoJSON')
+            logger.info(f"✓ GeoJSON saved: {geojson_file}")
+        except Exception as e:
+            logger.warning(f"Could not save GeoJSON: {e}")
+    
+    # Population statistics for the summary file and the console, computed once
+    stats = _population_stats(coords_data['population'])
     
     # Save summary statistics
     stats_file = output_path / f'exposure_nigeria_worldpop_{resolution_km}km_summary.txt'
@@ -277,35 +334,28 @@ def generate_exposure_worldpop(
             
             f.write("POPULATION STATISTICS\n")
             f.write("-" * 70 + "\n")
-            f.write(f"Number of exposure points: {len(coords_data['population']):,}\n")
-            f.write(f"Total population: {coords_data['population'].sum():,.0f}\n")
-            f.write(f"Mean population per cell: {coords_data['population'].mean():.1f}\n")
-            f.write(f"Median population per cell: {np.median(coords_data['population']):.1f}\n")
-            f.write(f"Max population per cell: {coords_data['population'].max():,.0f}\n")
-            f.write(f"Min population per cell: {coords_data['population'].min():.1f}\n\n")
+            f.write(f"Number of exposure points: {stats['count']:,}\n")
+            f.write(f"Total population: {stats['total']:,.0f}\n")
+            f.write(f"Mean population per cell: {stats['mean']:.1f}\n")
+            f.write(f"Median population per cell: {stats['percentiles'][50]:.1f}\n")
+            f.write(f"Max population per cell: {stats['max']:,.0f}\n")
+            f.write(f"Min population per cell: {stats['min']:.1f}\n\n")
             
             f.write("POPULATION DISTRIBUTION (Percentiles)\n")
             f.write("-" * 70 + "\n")
-            f.write(f"  10th percentile: {np.percentile(coords_data['population'], 10):.1f}\n")
-            f.write(f"  25th percentile: {np.percentile(coords_data['population'], 25):.1f}\n")
-            f.write(f"  50th percentile: {np.percentile(coords_data['population'], 50):.1f}\n")
-            f.write(f"  75th percentile: {np.percentile(coords_data['population'], 75):.1f}\n")
-            f.write(f"  90th percentile: {np.percentile(coords_data['population'], 90):.1f}\n")
-            f.write(f"  95th percentile: {np.percentile(coords_data['population'], 95):.1f}\n")
-            f.write(f"  99th percentile: {np.percentile(coords_data['population'], 99):.1f}\n\n")
+            for level in [10, 25, 50, 75, 90, 95, 99]:
+                f.write(f"  {level}th percentile: {stats['percentiles'][level]:.1f}\n")
+            f.write("\n")
             
             f.write("DENSITY STATISTICS\n")
             f.write("-" * 70 + "\n")
-            # Calculate cells in different density ranges
-            low_density = (coords_data['population'] < 50).sum()
-            medium_density = ((coords_data['population'] >= 50) & (coords_data['population'] < 200)).sum()
-            high_density = ((coords_data['population'] >= 200) & (coords_data['population'] < 500)).sum()
-            very_high_density = (coords_data['population'] >= 500).sum()
+            # Cells in different density ranges
+            low_density, medium_density, high_density, very_high_density = stats['density_counts']
             
-            f.write(f"Cells with <50 people: {low_density:,} ({100*low_density/len(coords_data['population']):.1f}%)\n")
-            f.write(f"Cells with 50-200 people: {medium_density:,} ({100*medium_density/len(coords_data['population']):.1f}%)\n")
-            f.write(f"Cells with 200-500 people: {high_density:,} ({100*high_density/len(coords_data['population']):.1f}%)\n")
-            f.write(f"Cells with >500 people: {very_high_density:,} ({100*very_high_density/len(coords_data['population']):.1f}%)\n")
+            f.write(f"Cells with <50 people: {low_density:,} ({100*low_density/stats['count']:.1f}%)\n")
+            f.write(f"Cells with 50-200 people: {medium_density:,} ({100*medium_density/stats['count']:.1f}%)\n")
+            f.write(f"Cells with 200-500 people: {high_density:,} ({100*high_density/stats['count']:.1f}%)\n")
+            f.write(f"Cells with >500 people: {very_high_density:,} ({100*very_high_density/stats['count']:.1f}%)\n")
         
         logger.info(f"✓ Summary saved: {stats_file}")
     except Exception as e:
@@ -316,9 +366,9 @@ def generate_exposure_worldpop(
     logger.info("EXPOSURE GENERATION COMPLETED SUCCESSFULLY")
     logger.info("=" * 70)
     logger.info(f"Output directory: {output_path.absolute()}")
-    logger.info(f"Number of exposure points: {len(coords_data['population']):,}")
-    logger.info(f"Total population: {coords_data['population'].sum():,.0f}")
-    logger.info(f"Mean population per cell: {coords_data['population'].mean():.1f}")
+    logger.info(f"Number of exposure points: {stats['count']:,}")
+    logger.info(f"Total population: {stats['total']:,.0f}")
+    logger.info(f"Mean population per cell: {stats['mean']:.1f}")
     logger.info(f"Coordinate ranges:")
     logger.info(f"  Latitude:  {coords_data['lats'].min():.2f}° to {coords_data['lats'].max():.2f}°")
     logger.info(f"  Longitude: {coords_data['lons'].min():.2f}° to {coords_data['lons'].max():.2f}°")
@@ -359,6 +409,11 @@ def main():
         default=0,
         help='Minimum population threshold to include a grid cell'
     )
+    parser.add_argument(
+        '--legacy-outputs',
+        action='store_true',
+        help='Also write the CSV and sampled GeoJSON outputs'
+    )
     
     args = parser.parse_args()
     
@@ -367,7 +422,8 @@ def main():
             worldpop_file=args.worldpop_file,
             output_dir=args.output,
             resolution_km=args.resolution,
-            min_population=args.min_population
+            min_population=args.min_population,
+            legacy_outputs=args.legacy_outputs
         )
         
         print("\n" + "🎉" * 35)
@@ -379,8 +435,10 @@ def main():
         print(f"   • Output location: {args.output}")
         print(f"\n💾 Files created:")
         print(f"   • HDF5: exposure_nigeria_worldpop_{args.resolution}km.hdf5")
-        print(f"   • CSV:  exposure_nigeria_worldpop_{args.resolution}km.csv")
-        print(f"   • GeoJSON: exposure_nigeria_worldpop_{args.resolution}km.geojson")
+        print(f"   • Parquet: exposure_nigeria_worldpop_{args.resolution}km.parquet")
+        if args.legacy_outputs:
+            print(f"   • CSV:  exposure_nigeria_worldpop_{args.resolution}km.csv")
+            print(f"   • GeoJSON: exposure_nigeria_worldpop_{args.resolution}km.geojson")
         print(f"   • Summary: exposure_nigeria_worldpop_{args.resolution}km_summary.txt")
         print()
         
@@ -5,69 +5,187 @@ IBF Database Manager
 Loads and integrates all data sources (DTM, NEMA, Exposure)
 """
 
+import hashlib
+import inspect
+import logging
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import config
+from ranking import pct_rank
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logging():
+    """Show IBFDatabase load progress on the console when run as a script"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
 
 class IBFDatabase:
     """
     Central database manager for IBF system
     Loads and integrates DTM displacement, NEMA floods, and exposure data
+    
+    When the integrated table is served from the cache, only dtm_monthly
+    and integrated_lga are loaded; the per-source tables stay None (and
+    nema_event_count 0). Call load_all_data() before using them or before
+    rebuilding with create_integrated_database().
     """
     
     def __init__(self):
         """Initialize and load all data"""
-        print("="*70)
-        print("LOADING IBF DATABASE")
-        print("="*70)
+        logger.info("=" * 70)
+        logger.info("LOADING IBF DATABASE")
+        logger.info("=" * 70)
         
         self.dtm_monthly = None
+        # Source tables - left unloaded (None / 0) on an integrated cache hit
         self.dtm_lga_stats = None
         self.nema_lga_risk = None
-        self.nema_full = None
+        self.nema_event_count = 0
         self.exposure = None
         self.integrated_lga = None
+        self._lga_index = None
+        self._state_codes = None
+        self._stats = None
+        self._key_dtypes = {}
         
-        self.load_all_data()
-        self.create_integrated_database()
+        cache_file = self._integrated_cache_file()
+        if cache_file is not None and cache_file.exists():
+            # Inputs unchanged since the last build: only the monthly events
+            # (needed for forecasts) have to be read again
+            logger.info("📂 Using cached integrated database: %s", cache_file.name)
+            integrated = pd.read_feather(cache_file)
+            self.dtm_monthly = self._load_table('dtm_monthly')
+            # Key categories come from the cached table (it was built with the
+            # shared dtypes), so the monthly events share its integer codes
+            self._key_dtypes = self._shared_key_dtypes(integrated)
+            self._categorize_keys(self.dtm_monthly)
+            self._categorize_keys(integrated)
+            self._set_integrated(integrated)
+            logger.info("✅ Integrated database: %d LGAs", len(self.integrated_lga))
+        else:
+            self.load_all_data()
+            self.create_integrated_database()
+            if cache_file is not None:
+                self._write_integrated_cache(cache_file)
         
     def load_all_data(self):
         """Load all data files"""
-        print("\n📂 Loading data files...")
+        logger.info("📂 Loading data files...")
         
+        # The files are independent and CSV/Parquet parsing releases the GIL,
+        # so read them concurrently
+        names = ['dtm_monthly', 'dtm_lga_stats', 'nema_lga_risk', 'exposure_csv']
         try:
-            # DTM displacement data
-            self.dtm_monthly = pd.read_csv(config.DATA_FILES['dtm_monthly'])
-            print(f"✅ DTM monthly events: {len(self.dtm_monthly):,} records")
-            
-            self.dtm_lga_stats = pd.read_csv(config.DATA_FILES['dtm_lga_stats'])
-            print(f"✅ DTM LGA statistics: {len(self.dtm_lga_stats)} LGAs")
-            
-            # NEMA flood data
-            self.nema_lga_risk = pd.read_csv(config.DATA_FILES['nema_lga_risk'])
-            print(f"✅ NEMA LGA flood risk: {len(self.nema_lga_risk)} LGAs")
-            
-            self.nema_full = pd.read_csv(config.DATA_FILES['nema_full'])
-            print(f"✅ NEMA flood events: {len(self.nema_full):,} events")
-            
-            # Exposure data
-            self.exposure = pd.read_csv(config.DATA_FILES['exposure_csv'])
-            print(f"✅ Exposure data: {len(self.exposure)} LGAs")
-            
+            with ThreadPoolExecutor(max_workers=len(names) + 1) as executor:
+                futures = {name: executor.submit(self._load_table, name) for name in names}
+                # Only the size of the (large) full event file is used
+                futures['nema_full'] = executor.submit(self._count_rows, 'nema_full')
+                loaded = {name: future.result() for name, future in futures.items()}
         except FileNotFoundError as e:
-            print(f"❌ Error loading data: {e}")
+            logger.error("❌ Error loading data: %s", e)
             raise
+        
+        # DTM displacement data
+        self.dtm_monthly = loaded['dtm_monthly']
+        logger.info("✅ DTM monthly events: %s records", f"{len(self.dtm_monthly):,}")
+        
+        self.dtm_lga_stats = loaded['dtm_lga_stats']
+        logger.info("✅ DTM LGA statistics: %d LGAs", len(self.dtm_lga_stats))
+        
+        # NEMA flood data
+        self.nema_lga_risk = loaded['nema_lga_risk']
+        logger.info("✅ NEMA LGA flood risk: %d LGAs", len(self.nema_lga_risk))
+        
+        self.nema_event_count = loaded['nema_full']
+        logger.info("✅ NEMA flood events: %s events", f"{self.nema_event_count:,}")
+        
+        # Exposure data
+        self.exposure = loaded['exposure_csv']
+        logger.info("✅ Exposure data: %d LGAs", len(self.exposure))
+        
+        # One categorical dtype per key column, shared by every table, so
+        # merges and per-LGA filters compare integer codes
+        self._key_dtypes = self._shared_key_dtypes()
+        
+        # Monthly events are filtered by state/LGA for every forecast
+        self._categorize_keys(self.dtm_monthly)
+    
+    def _shared_key_dtypes(self, *extra):
+        """Build state/lga CategoricalDtypes covering the keys of all loaded tables (and any extra ones)"""
+        values = {'state': set(), 'lga': set()}
+        for df in (self.dtm_monthly, self.dtm_lga_stats, self.nema_lga_risk, self.exposure, *extra):
+            if df is None:
+                continue
+            for col in values:
+                if col not in df.columns:
+                    continue
+                if isinstance(df[col].dtype, pd.CategoricalDtype):
+                    values[col].update(df[col].cat.categories)
+                else:
+                    values[col].update(df[col].dropna().unique())
+        
+        # Exposure without state/lga is joined on its LGA name column
+        if self.exposure is not None and 'lga' not in self.exposure.columns:
+            for name_col in ('lga_name', 'name'):
+                if name_col in self.exposure.columns:
+                    values['lga'].update(self.exposure[name_col].dropna().unique())
+                    break
+        
+        return {col: pd.CategoricalDtype(sorted(keys)) for col, keys in values.items()}
+    
+    def _load_table(self, name):
+        """Load a data file, going through the Parquet cache when enabled"""
+        path = Path(config.DATA_FILES[name])
+        if not config.USE_PARQUET_CACHE:
+            return self._read_csv(path)
+        
+        cache_file = config.DATA_DIR / 'cache' / f'{name}.parquet'
+        if cache_file.exists() and cache_file.stat().st_mtime >= path.stat().st_mtime:
+            return pd.read_parquet(cache_file, engine='pyarrow')
+        
+        df = self._read_csv(path)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(cache_file, engine='pyarrow', compression='zstd', index=False)
+        except (ImportError, OSError) as e:
+            logger.warning("Could not cache %s as Parquet: %s", path.name, e)
+        return df
+    
+    def _count_rows(self, name, chunksize=200_000):
+        """Count the records of a data file in chunks, parsing only its first column"""
+        path = Path(config.DATA_FILES[name])
+        return sum(len(chunk) for chunk in pd.read_csv(path, chunksize=chunksize, usecols=[0]))
+    
+    def _read_csv(self, path):
+        """Read a CSV with the multi-threaded pyarrow parser when available"""
+        try:
+            return pd.read_csv(path, engine='pyarrow')
+        except ImportError:
+            return pd.read_csv(path)
+    
+    def _categorize_keys(self, df):
+        """Store state/lga as categoricals so equality masks compare integer codes"""
+        for col in ('state', 'lga'):
+            if col in df.columns:
+                df[col] = df[col].astype(self._key_dtypes.get(col, 'category'))
     
     def create_integrated_database(self):
         """Create integrated LGA-level database"""
-        print("\n🔗 Creating integrated LGA database...")
+        logger.info("🔗 Creating integrated LGA database...")
+        
+        if not self._key_dtypes:
+            self._key_dtypes = self._shared_key_dtypes()
         
         # Check if exposure has state/lga columns
         if 'state' not in self.exposure.columns:
             # Use DTM data as base (has state/lga)
-            print("   Using DTM data as base (exposure lacks state/lga columns)")
+            logger.info("   Using DTM data as base (exposure lacks state/lga columns)")
             integrated = self.dtm_lga_stats[['state', 'lga']].copy()
+            self._categorize_keys(integrated)
             
             # Try to add population if available in exposure
             if 'lga_name' in self.exposure.columns or 'name' in self.exposure.columns:
@@ -75,14 +193,15 @@ class IBFDatabase:
                 pop_col = 'population' if 'population' in self.exposure.columns else 'value'
                 if pop_col in self.exposure.columns:
                     exp_subset = self.exposure[[name_col, pop_col]].rename(columns={name_col: 'lga', pop_col: 'population'})
-                    integrated = integrated.merge(exp_subset, on='lga', how='left')
+                    self._categorize_keys(exp_subset)
+                    integrated = integrated.merge(exp_subset, on='lga', how='left', sort=False)
         else:
             # Use exposure data as base
             integrated = self.exposure.copy()
         
         # Ensure we have population column
         if 'population' not in integrated.columns:
-            print("   Warning: No population data available, using default values")
+            logger.warning("No population data available, using default values")
             integrated['population'] = 50000  # Default population
         
         # Add DTM statistics
@@ -97,12 +216,6 @@ class IBFDatabase:
             'most_common_hazard': 'dtm_hazard_type'
         })
         
-        integrated = integrated.merge(
-            dtm_subset, 
-            on=['state', 'lga'], 
-            how='outer'  # Changed to outer to keep all LGAs
-        )
-        
         # Add NEMA flood risk
         nema_cols = ['state', 'lga', 'total_events', 'total_affected', 
                     'events_per_year', 'flood_risk_score']
@@ -114,104 +227,245 @@ class IBFDatabase:
             'flood_risk_score': 'nema_flood_risk'
         })
         
-        integrated = integrated.merge(
-            nema_subset,
-            on=['state', 'lga'],
-            how='left'
-        )
+        # Shared categorical keys, so alignment compares integer codes
+        for df in (integrated, dtm_subset, nema_subset):
+            self._categorize_keys(df)
+        
+        keys = ['state', 'lga']
+        integrated = integrated.set_index(keys)
+        dtm_subset = self._one_row_per_lga(dtm_subset.set_index(keys), 'DTM')
+        nema_subset = self._one_row_per_lga(nema_subset.set_index(keys), 'NEMA')
+        
+        # Canonical LGA set: the base plus DTM LGAs it lacks (keeps all LGAs, as
+        # the old outer merge did); NEMA only fills in LGAs already present
+        missing = dtm_subset.index.difference(integrated.index)
+        if len(missing) > 0:
+            integrated = pd.concat([integrated, pd.DataFrame(index=missing)])
+        integrated = integrated.sort_index()
+        
+        integrated = pd.concat([
+            integrated,
+            dtm_subset.reindex(integrated.index),
+            nema_subset.reindex(integrated.index),
+        ], axis=1).reset_index()
         
         # Fill NaN values
-        integrated['dtm_total_idps'] = integrated['dtm_total_idps'].fillna(0)
-        integrated['dtm_num_events'] = integrated['dtm_num_events'].fillna(0)
-        integrated['nema_flood_events'] = integrated['nema_flood_events'].fillna(0)
-        integrated['nema_flood_risk'] = integrated['nema_flood_risk'].fillna(0)
+        integrated.fillna({
+            'dtm_total_idps': 0,
+            'dtm_num_events': 0,
+            'nema_flood_events': 0,
+            'nema_flood_risk': 0
+        }, inplace=True)
         
         # Calculate composite risk scores
         integrated['has_conflict_data'] = integrated['dtm_num_events'] > 0
         integrated['has_flood_data'] = integrated['nema_flood_events'] > 0
         
-        # Composite risk (0-100 scale)
-        integrated['conflict_risk'] = self._calculate_conflict_risk(integrated)
-        integrated['flood_risk'] = self._normalize_risk(integrated['nema_flood_risk'])
-        integrated['composite_risk'] = integrated[['conflict_risk', 'flood_risk']].max(axis=1)
+        # Composite risk (0-100 scale), computed straight into float32 arrays
+        conflict = self._calculate_conflict_risk(integrated).to_numpy(dtype=np.float32)
+        flood = self._normalize_risk(integrated['nema_flood_risk'])
+        integrated['conflict_risk'] = conflict
+        integrated['flood_risk'] = flood
+        # A single ufunc pass, no temporary frame; DataFrame.eval would add
+        # expression parsing on top and needs numexpr to be any faster
+        integrated['composite_risk'] = np.maximum(conflict, flood)
+        
+        # Risk categories (left-closed bins, so a score on a threshold moves up a level)
+        integrated['risk_level'] = self._categorize_risk(integrated['composite_risk'])
         
-        # Risk categories
-        integrated['risk_level'] = integrated['composite_risk'].apply(self._categorize_risk)
+        self._categorize_keys(integrated)
+        self._downcast(integrated)
         
+        self._set_integrated(integrated)
+        logger.info("✅ Integrated database: %d LGAs", self._stats['n'])
+        logger.info("   - %d LGAs with conflict data", self._stats['n_conflict'])
+        logger.info("   - %d LGAs with flood data", self._stats['n_flood'])
+        
+    def _one_row_per_lga(self, df, source):
+        """Drop repeated (state, lga) keys so the table can be aligned by reindex"""
+        duplicated = df.index.duplicated()
+        if duplicated.any():
+            logger.warning("%d duplicate LGA rows in %s data, keeping first", duplicated.sum(), source)
+            df = df[~duplicated]
+        return df
+    
+    def _set_integrated(self, integrated):
+        """Install the integrated table and reset everything derived from it"""
         self.integrated_lga = integrated
-        print(f"✅ Integrated database: {len(self.integrated_lga)} LGAs")
-        print(f"   - {integrated['has_conflict_data'].sum()} LGAs with conflict data")
-        print(f"   - {integrated['has_flood_data'].sum()} LGAs with flood data")
+        # (state, lga) index for O(1) profile lookups
+        self._lga_index = integrated.set_index(['state', 'lga'], drop=False).sort_index()
+        self._state_codes = None
+        # Summary counters, computed once instead of rescanning for every report
+        self._stats = {
+            'n': len(integrated),
+            'n_conflict': int(integrated['has_conflict_data'].sum()),
+            'n_flood': int(integrated['has_flood_data'].sum()),
+            'total_pop': float(integrated['population'].sum()),
+            'risk_counts': integrated['risk_level'].value_counts().to_dict(),
+        }
+    
+    def _integrated_cache_file(self):
+        """Feather cache path keyed on input mtimes, risk thresholds and the building code (None if disabled)"""
+        if not config.USE_INTEGRATED_CACHE:
+            return None
         
+        try:
+            stamps = sorted(
+                (name, str(path), Path(path).stat().st_mtime_ns)
+                for name, path in config.DATA_FILES.items()
+            )
+        except FileNotFoundError:
+            return None  # let load_all_data report the missing file
+        
+        # Editing the integration/risk code - this module and the modules it
+        # builds with - must also invalidate the cache
+        code_mtimes = [
+            Path(f).stat().st_mtime_ns
+            for f in (__file__, inspect.getfile(pct_rank), config.__file__)
+        ]
+        
+        key = hashlib.sha1(
+            repr((stamps, sorted(config.RISK_THRESHOLDS.items()), code_mtimes)).encode()
+        ).hexdigest()[:16]
+        return config.DATA_DIR / 'cache' / f'integrated_{key}.feather'
+    
+    def _write_integrated_cache(self, cache_file):
+        """Persist the integrated table, then drop the caches for older inputs"""
+        # Written under a temporary name and renamed, so a failed write
+        # neither leaves a truncated cache nor loses the previous one
+        tmp_file = cache_file.with_suffix('.tmp')
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.integrated_lga.to_feather(tmp_file, compression='zstd')
+            tmp_file.replace(cache_file)
+        except (ImportError, OSError) as e:
+            logger.warning("Could not cache integrated database: %s", e)
+            tmp_file.unlink(missing_ok=True)
+            return
+        
+        for stale in cache_file.parent.glob('integrated_*.feather'):
+            if stale != cache_file:
+                stale.unlink(missing_ok=True)
+    
+    def _downcast(self, df):
+        """Shrink the integrated table: categorical labels, small ints, float32 scores"""
+        for col in ('dtm_hazard_type', 'risk_level'):
+            df[col] = df[col].astype('category')
+        
+        # Counts are whole numbers once NaNs are filled; anything else stays float.
+        # Signed, so differences of counts cannot wrap around
+        for col in ('dtm_total_idps', 'dtm_num_events', 'nema_flood_events'):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+        
+        for col in ('conflict_risk', 'flood_risk', 'composite_risk', 'nema_flood_risk'):
+            df[col] = df[col].astype('float32')
+    
     def _calculate_conflict_risk(self, df):
         """Calculate normalized conflict risk (0-100)"""
         if 'dtm_events_per_year' not in df.columns:
             return pd.Series(0, index=df.index)
         
-        risk = df['dtm_events_per_year'].fillna(0).rank(pct=True) * 100
-        return risk.round(1)
+        # Percentile rank with ties averaged, same as Series.rank(pct=True)
+        risk = pct_rank(df['dtm_events_per_year'].fillna(0).to_numpy()) * 100
+        return pd.Series(risk.round(1), index=df.index)
     
     def _normalize_risk(self, series):
-        """Normalize risk to 0-100 scale"""
-        return series.fillna(0).clip(0, 100)
+        """Normalize risk to a 0-100 float32 array (NaN counts as 0)"""
+        risk = series.to_numpy(dtype=np.float32, na_value=0, copy=True)
+        np.clip(risk, 0, 100, out=risk)
+        return risk
     
-    def _categorize_risk(self, risk_score):
-        """Categorize risk score into levels"""
-        if risk_score >= config.RISK_THRESHOLDS['very_high'] * 100:
-            return 'very_high'
-        elif risk_score >= config.RISK_THRESHOLDS['high'] * 100:
-            return 'high'
-        elif risk_score >= config.RISK_THRESHOLDS['moderate'] * 100:
-            return 'moderate'
-        else:
-            return 'low'
+    def _categorize_risk(self, risk_scores):
+        """Categorize risk scores into levels"""
+        bins = [
+            -np.inf,
+            config.RISK_THRESHOLDS['moderate'] * 100,
+            config.RISK_THRESHOLDS['high'] * 100,
+            config.RISK_THRESHOLDS['very_high'] * 100,
+            np.inf,
+        ]
+        levels = pd.cut(risk_scores, bins=bins, right=False,
+                        labels=['low', 'moderate', 'high', 'very_high'])
+        return levels
     
     def get_lga_profile(self, state, lga):
         """Get complete risk profile for an LGA"""
-        lga_data = self.integrated_lga[
-            (self.integrated_lga['state'] == state) & 
-            (self.integrated_lga['lga'] == lga)
-        ]
-        
-        if len(lga_data) == 0:
+        try:
+            lga_data = self._lga_index.loc[(state, lga)]
+        except (KeyError, TypeError):
             return None
         
-        return lga_data.iloc[0].to_dict()
+        if isinstance(lga_data, pd.DataFrame):
+            # Duplicate keys - keep the first row, as the old mask scan did
+            lga_data = lga_data.iloc[0]
+        
+        return lga_data.to_dict()
     
     def get_high_risk_lgas(self, threshold=60, limit=20):
         """Get high-risk LGAs"""
-        high_risk = self.integrated_lga[
+        high_risk = self.integrated_lga.loc[
             self.integrated_lga['composite_risk'] >= threshold
-        ].sort_values('composite_risk', ascending=False).head(limit)
+        ].nlargest(limit, 'composite_risk')
         
         return high_risk[['state', 'lga', 'conflict_risk', 'flood_risk', 
                          'composite_risk', 'risk_level', 'population']]
     
     def get_state_summary(self):
         """Get state-level summary"""
-        summary = self.integrated_lga.groupby('state').agg({
-            'lga': 'count',
-            'population': 'sum',
-            'dtm_total_idps': 'sum',
-            'nema_flood_affected': 'sum',
-            'conflict_risk': 'mean',
-            'flood_risk': 'mean',
-            'composite_risk': 'mean'
-        }).round(1)
-        
-        summary.columns = ['num_lgas', 'total_pop', 'total_idps', 
-                          'flood_affected', 'avg_conflict_risk', 
-                          'avg_flood_risk', 'avg_composite_risk']
+        df = self.integrated_lga
+        if self._state_codes is None:
+            # Low-cardinality state codes: every reduction becomes one np.bincount
+            codes = df['state'].cat.codes.to_numpy()
+            valid = codes >= 0
+            self._state_codes = (codes[valid], valid)
+        codes, valid = self._state_codes
+        n_states = len(df['state'].cat.categories)
+        
+        def group_sum(col):
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)[valid]
+            present = ~np.isnan(values)
+            sums = np.bincount(codes[present], weights=values[present], minlength=n_states)
+            counts = np.bincount(codes[present], minlength=n_states)
+            return sums, counts
+        
+        def group_mean(col):
+            sums, counts = group_sum(col)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return sums / counts
+        
+        num_lgas = np.bincount(codes[df['lga'].notna().to_numpy()[valid]], minlength=n_states)
+        summary = pd.DataFrame({
+            'num_lgas': num_lgas,
+            'total_pop': group_sum('population')[0],
+            'total_idps': group_sum('dtm_total_idps')[0],
+            'flood_affected': group_sum('nema_flood_affected')[0],
+            'avg_conflict_risk': group_mean('conflict_risk'),
+            'avg_flood_risk': group_mean('flood_risk'),
+            'avg_composite_risk': group_mean('composite_risk'),
+        }, index=pd.CategoricalIndex(df['state'].cat.categories,
+                                     dtype=df['state'].dtype, name='state'))
+        
+        # Only states that occur in the table (groupby observed=True)
+        observed = np.bincount(codes, minlength=n_states) > 0
+        summary = summary[observed].round(1)
+        if pd.api.types.is_integer_dtype(df['dtm_total_idps']):
+            summary['total_idps'] = summary['total_idps'].astype(np.int64)
         
         return summary.sort_values('avg_composite_risk', ascending=False)
     
-    def export_integrated_database(self, output_file=None):
-        """Export integrated database"""
+    def export_integrated_database(self, output_file=None, fmt='parquet'):
+        """Export integrated database as Parquet (default, keeps dtypes) or CSV"""
+        if fmt not in ('parquet', 'csv'):
+            raise ValueError(f"Unknown export format: {fmt}")
+        
         if output_file is None:
-            output_file = config.DATA_DIR / 'integrated_lga_database.csv'
+            output_file = config.DATA_DIR / f'integrated_lga_database.{fmt}'
         
-        self.integrated_lga.to_csv(output_file, index=False)
-        print(f"\n💾 Exported integrated database: {output_file}")
+        if fmt == 'parquet':
+            self.integrated_lga.to_parquet(output_file, compression='zstd', index=False)
+        else:
+            self.integrated_lga.to_csv(output_file, index=False)
+        logger.info("💾 Exported integrated database: %s", output_file)
         
         return output_file
 
@@ -228,16 +482,16 @@ def main():
     print("="*70)
     
     print(f"\n📊 LGA-Level Data:")
-    print(f"   Total LGAs: {len(db.integrated_lga)}")
-    print(f"   Total population: {db.integrated_lga['population'].sum():,.0f}")
-    print(f"   LGAs with conflict data: {db.integrated_lga['has_conflict_data'].sum()}")
-    print(f"   LGAs with flood data: {db.integrated_lga['has_flood_data'].sum()}")
+    stats = db._stats
+    print(f"   Total LGAs: {stats['n']}")
+    print(f"   Total population: {stats['total_pop']:,.0f}")
+    print(f"   LGAs with conflict data: {stats['n_conflict']}")
+    print(f"   LGAs with flood data: {stats['n_flood']}")
     
     print(f"\n🎯 Risk Distribution:")
-    risk_counts = db.integrated_lga['risk_level'].value_counts()
     for level in ['very_high', 'high', 'moderate', 'low']:
-        count = risk_counts.get(level, 0)
-        pct = count / len(db.integrated_lga) * 100
+        count = stats['risk_counts'].get(level, 0)
+        pct = count / stats['n'] * 100
         print(f"   {level:12s} {count:4d} LGAs ({pct:5.1f}%)")
     
     print(f"\n🏆 Top 10 High-Risk LGAs:")
@@ -258,4 +512,5 @@ def main():
 
 
 if __name__ == "__main__":
+    configure_logging()
     db = main()
@@ -10,9 +10,38 @@ import numpy as np
 from pathlib import Path
 from datetime import datetime
 
+from table_io import (
+    load_cached_tables, save_cached_tables, write_parquet, write_csv, write_excel, read_excel
+)
+
+# Primary hazard labels, sorted so category order matches astype('category')
+HAZARD_LABELS = ['Conflict', 'Insecurity', 'Natural Disaster', 'Other', 'Unknown']
+
+# Standard names for the IDP_Admin2 columns the tables are built from; the
+# other workbook columns (id, operation, admin0*, idpOrigin*) pass through
+DTM_COLUMNS = {
+    'reportingDate': 'date',
+    'yearReportingDate': 'year',
+    'monthReportingDate': 'month',
+    'admin1Name': 'state',
+    'admin1Pcode': 'state_pcode',
+    'admin2Name': 'lga',
+    'admin2Pcode': 'lga_pcode',
+    'numPresentIdpInd': 'idps_present',
+    'displacementReason': 'displacement_reason',
+    'numberMales': 'males',
+    'numberFemales': 'females',
+    'roundNumber': 'dtm_round',
+    'assessmentType': 'assessment_type'
+}
+
+
 def process_dtm_displacement_data(
     input_file='/mnt/user-data/uploads/2017_2024_Nigeria_displacement_events.xlsx',
-    output_dir='data'
+    output_dir='data',
+    use_cache=True,
+    emit_csv=True,
+    emit_xlsx=False
 ):
     """
     Process DTM displacement data for IBF system
@@ -25,6 +54,11 @@ def process_dtm_displacement_data(
     Args:
         input_file: Path to DTM Excel file
         output_dir: Where to save processed files
+        use_cache: Reuse the Parquet tables in <output_dir>/cache when the
+            input file is unchanged (skips Excel parsing and aggregation)
+        emit_csv: Write the CSV outputs (read by ibf_database)
+        emit_xlsx: Write the multi-sheet Excel workbook; otherwise the same
+            sheets are written as a directory of Parquet files
     """
     
     print("="*70)
@@ -34,9 +68,88 @@ def process_dtm_displacement_data(
     # Create output directory
     Path(output_dir).mkdir(exist_ok=True)
     
+    cache_dir = Path(output_dir) / 'cache'
+    tables = load_cached_tables(cache_dir, 'dtm', input_file, __file__) if use_cache else None
+    if tables is not None:
+        print(f"\n📂 Input unchanged since last run - using cached tables in {cache_dir}")
+        df_clean, events_monthly, lga_stats, state_stats = tables
+    else:
+        df_clean, events_monthly, lga_stats, state_stats = build_dtm_tables(input_file)
+        if use_cache:
+            save_cached_tables(cache_dir, 'dtm', input_file, __file__,
+                               [df_clean, events_monthly, lga_stats, state_stats])
+    
+    # ========================================================================
+    # Save processed data
+    # ========================================================================
+    
+    print("\n💾 Saving processed files...")
+    
+    if emit_csv:
+        # 1. Full cleaned dataset
+        output_full = f"{output_dir}/dtm_displacement_data_cleaned.csv"
+        write_csv(df_clean, output_full)
+        print(f"✅ Saved: {output_full} ({len(df_clean):,} records)")
+        
+        # 2. Monthly aggregated events
+        output_monthly = f"{output_dir}/displacement_events_monthly.csv"
+        write_csv(events_monthly, output_monthly)
+        print(f"✅ Saved: {output_monthly} ({len(events_monthly):,} events)")
+        
+        # 3. LGA statistics
+        output_lga = f"{output_dir}/displacement_statistics_by_lga.csv"
+        write_csv(lga_stats, output_lga)
+        print(f"✅ Saved: {output_lga} ({len(lga_stats)} LGAs)")
+        
+        # 4. State statistics
+        output_state = f"{output_dir}/displacement_statistics_by_state.csv"
+        write_csv(state_stats, output_state)
+        print(f"✅ Saved: {output_state} ({len(state_stats)} states)")
+    
+    # 5. All sheets in one workbook, or one Parquet file per sheet
+    sheets = {
+        'All_Records': df_clean,
+        'Monthly_Events': events_monthly,
+        'LGA_Statistics': lga_stats,
+        'State_Statistics': state_stats
+    }
+    if emit_xlsx:
+        output_excel = f"{output_dir}/dtm_displacement_processed.xlsx"
+        write_excel(output_excel, sheets)
+        print(f"✅ Saved: {output_excel}")
+    else:
+        output_sheets = Path(output_dir) / 'dtm_displacement_processed'
+        output_sheets.mkdir(exist_ok=True)
+        for sheet_name, df in sheets.items():
+            write_parquet(df, output_sheets / f'{sheet_name}.parquet')
+        print(f"✅ Saved: {output_sheets}/ ({len(sheets)} Parquet sheets)")
+    
+    # ========================================================================
+    # Print summary
+    # ========================================================================
+    
+    print_processing_summary(df_clean, events_monthly, lga_stats, state_stats)
+    
+    return df_clean, events_monthly, lga_stats, state_stats
+
+
+def build_dtm_tables(input_file):
+    """
+    Load the DTM workbook and build the cleaned, monthly, LGA and state tables
+    
+    Args:
+        input_file: Path to DTM Excel file
+    
+    Returns:
+        (df_clean, events_monthly, lga_stats, state_stats)
+    """
+    
     # Load DTM data
     print(f"\n📂 Loading data from: {input_file}")
-    df = pd.read_excel(input_file, sheet_name='IDP_Admin2')
+    df = read_excel(
+        input_file, 'IDP_Admin2', parse_dates=['reportingDate'],
+        dtype={'numberMales': 'Int64', 'numberFemales': 'Int64'}
+    )
     
     print(f"✅ Loaded {len(df):,} records")
     print(f"   Date range: {df['reportingDate'].min()} to {df['reportingDate'].max()}")
@@ -49,69 +162,93 @@ def process_dtm_displacement_data(
     print("\n🔧 Cleaning and standardizing data...")
     
     # Rename columns to standard names
-    df_clean = df.rename(columns={
-        'reportingDate': 'date',
-        'yearReportingDate': 'year',
-        'monthReportingDate': 'month',
-        'admin1Name': 'state',
-        'admin1Pcode': 'state_pcode',
-        'admin2Name': 'lga',
-        'admin2Pcode': 'lga_pcode',
-        'numPresentIdpInd': 'idps_present',
-        'displacementReason': 'displacement_reason',
-        'numberMales': 'males',
-        'numberFemales': 'females',
-        'roundNumber': 'dtm_round',
-        'assessmentType': 'assessment_type'
-    })
+    df_clean = df.rename(columns=DTM_COLUMNS)
+    
+    # Low-cardinality text columns become categories straight away: each
+    # distinct string is stored once and the groupby keys below hash small
+    # integer codes instead of Python strings
+    for col in ['state', 'state_pcode', 'lga', 'lga_pcode',
+                'displacement_reason', 'assessment_type']:
+        df_clean[col] = df_clean[col].astype('category')
     
     # Add derived fields
-    df_clean['total_population'] = df_clean['males'].fillna(0) + df_clean['females'].fillna(0)
+    # Row sum skips missing counts (no gender breakdown -> 0)
+    df_clean['total_population'] = df_clean[['males', 'females']].sum(axis=1)
     df_clean['has_gender_data'] = df_clean['males'].notna()
     
-    # Categorize displacement reasons
-    df_clean['primary_hazard'] = df_clean['displacement_reason'].apply(categorize_hazard)
-    df_clean['is_conflict'] = df_clean['displacement_reason'].str.contains('Conflict', case=False, na=False)
-    df_clean['is_flood'] = df_clean['displacement_reason'].str.contains('Natural disaster', case=False, na=False)
-    df_clean['is_insecurity'] = df_clean['displacement_reason'].str.contains('Insecurity', case=False, na=False)
+    # Categorize displacement reasons - scan each distinct reason once and
+    # broadcast the flags to records through the category codes (code -1 is
+    # a missing reason, which picks up the trailing False)
+    # Priority order: Natural disaster > Conflict > Insecurity
+    reason_codes = df_clean['displacement_reason'].cat.codes.to_numpy()
+    reasons = df_clean['displacement_reason'].cat.categories.str.lower()
+    is_flood = np.append(reasons.str.contains('natural disaster', regex=False), False)[reason_codes]
+    is_conflict = np.append(reasons.str.contains('conflict', regex=False), False)[reason_codes]
+    is_insecurity = np.append(reasons.str.contains('insecurity', regex=False), False)[reason_codes]
+    # Pick int8 codes into the (sorted) hazard labels rather than
+    # materializing one label string per record
+    hazard_codes = np.select(
+        [reason_codes == -1, is_flood, is_conflict, is_insecurity],
+        [4, 2, 0, 1],  # Unknown, Natural Disaster, Conflict, Insecurity
+        default=3      # Other
+    ).astype(np.int8)
+    df_clean['primary_hazard'] = pd.Categorical.from_codes(
+        hazard_codes, HAZARD_LABELS
+    ).remove_unused_categories()
+    df_clean['is_conflict'] = is_conflict
+    df_clean['is_flood'] = is_flood
+    df_clean['is_insecurity'] = is_insecurity
     
     # Add quarter
     df_clean['quarter'] = df_clean['date'].dt.quarter
     
+    # Compact integer dtypes for the groupby keys
+    for col in ['year', 'month', 'quarter', 'dtm_round']:
+        df_clean[col] = pd.to_numeric(df_clean[col], downcast='integer')
+    
     # ========================================================================
     # Create aggregated event database
     # ========================================================================
     
     print("\n📊 Creating aggregated event database...")
     
-    # Aggregate by state, LGA, month for forecasting
-    events_monthly = df_clean.groupby([
+    # One pass at the finest grain (month x LGA x hazard); the LGA and state
+    # tables below are reductions of it rather than fresh scans of df_clean.
+    # dropna=False keeps rows with a missing month/pcode for those coarser tables.
+    # Every partial here (sum/count/size/min/max) is decomposable, so if the
+    # record table outgrows memory this pass can run per row chunk and the
+    # chunk results be re-grouped with the same reductions.
+    monthly_keys = [
         'year', 'month', 'quarter', 'state', 'state_pcode', 'lga', 'lga_pcode', 'primary_hazard'
-    ]).agg({
-        'idps_present': ['sum', 'mean', 'count'],
-        'males': 'sum',
-        'females': 'sum',
-        'dtm_round': 'max'
-    }).reset_index()
-    
-    # Flatten column names
-    events_monthly.columns = ['_'.join(col).strip('_') if col[1] else col[0] 
-                              for col in events_monthly.columns.values]
-    
-    # Rename aggregated columns
-    events_monthly = events_monthly.rename(columns={
-        'idps_present_sum': 'total_idps',
-        'idps_present_mean': 'mean_idps_per_record',
-        'idps_present_count': 'num_records',
-        'males_sum': 'total_males',
-        'females_sum': 'total_females',
-        'dtm_round_max': 'latest_dtm_round'
-    })
-    
-    # Add date column
-    events_monthly['date'] = pd.to_datetime(
-        events_monthly[['year', 'month']].assign(day=1)
+    ]
+    fine = df_clean.groupby(monthly_keys, observed=True, dropna=False).agg(
+        total_idps=('idps_present', 'sum'),
+        num_records=('idps_present', 'count'),
+        total_males=('males', 'sum'),
+        total_females=('females', 'sum'),
+        latest_dtm_round=('dtm_round', 'max'),
+        max_idps=('idps_present', 'max'),
+        num_rows=('idps_present', 'size'),
+        first_date=('date', 'min'),
+        last_date=('date', 'max')
+    ).reset_index()
+    
+    # Aggregate by state, LGA, month for forecasting
+    events_monthly = fine.dropna(subset=monthly_keys).reset_index(drop=True)
+    events_monthly['mean_idps_per_record'] = (
+        events_monthly['total_idps'] / events_monthly['num_records']
     )
+    events_monthly = events_monthly[monthly_keys + [
+        'total_idps', 'mean_idps_per_record', 'num_records',
+        'total_males', 'total_females', 'latest_dtm_round'
+    ]]
+    
+    # Add date column (first of the month) with datetime64 arithmetic
+    years = events_monthly['year'].to_numpy('int64') - 1970
+    months = events_monthly['month'].to_numpy('int64') - 1
+    events_monthly['date'] = (
+        years.astype('datetime64[Y]') + months.astype('timedelta64[M]')
+    ).astype(df_clean['date'].dtype)
     
     print(f"✅ Created {len(events_monthly):,} monthly aggregated events")
     
@@ -121,25 +258,27 @@ def process_dtm_displacement_data(
     
     print("\n📈 Creating LGA-level statistics...")
     
-    lga_stats = df_clean.groupby(['state', 'lga', 'lga_pcode']).agg({
-        'idps_present': ['sum', 'mean', 'max', 'count'],
-        'date': ['min', 'max'],
-        'primary_hazard': lambda x: x.mode()[0] if len(x) > 0 else 'Unknown'
-    }).reset_index()
-    
-    # Flatten columns
-    lga_stats.columns = ['_'.join(col).strip('_') if col[1] else col[0] 
-                         for col in lga_stats.columns.values]
-    
-    lga_stats = lga_stats.rename(columns={
-        'idps_present_sum': 'total_idps_all_time',
-        'idps_present_mean': 'mean_idps_per_event',
-        'idps_present_max': 'max_idps_single_event',
-        'idps_present_count': 'num_events',
-        'date_min': 'first_event_date',
-        'date_max': 'last_event_date',
-        'primary_hazard_<lambda>': 'most_common_hazard'
-    })
+    lga_keys = ['state', 'lga', 'lga_pcode']
+    lga_fine = fine.dropna(subset=lga_keys)
+    lga_stats = lga_fine.groupby(lga_keys, observed=True).agg(
+        total_idps_all_time=('total_idps', 'sum'),
+        max_idps_single_event=('max_idps', 'max'),
+        num_events=('num_records', 'sum'),
+        first_event_date=('first_date', 'min'),
+        last_event_date=('last_date', 'max')
+    )
+    lga_stats.insert(
+        1, 'mean_idps_per_event',
+        lga_stats['total_idps_all_time'] / lga_stats['num_events']
+    )
+    
+    # Most common hazard: first label with the highest record count
+    # (hazards are sorted, matching Series.mode()[0] on ties)
+    hazard_counts = lga_fine.groupby(lga_keys + ['primary_hazard'], observed=True)['num_rows'].sum()
+    lga_stats['most_common_hazard'] = (
+        hazard_counts.groupby(level=[0, 1, 2], observed=True).idxmax().str[-1]
+    )
+    lga_stats = lga_stats.reset_index()
     
     # Calculate event frequency (events per year)
     lga_stats['years_covered'] = (
@@ -157,86 +296,19 @@ def process_dtm_displacement_data(
     
     print("\n🗺️  Creating state-level statistics...")
     
-    state_stats = df_clean.groupby('state').agg({
-        'idps_present': ['sum', 'mean', 'count'],
-        'lga': 'nunique',
-        'date': ['min', 'max']
-    }).reset_index()
-    
-    state_stats.columns = ['_'.join(col).strip('_') if col[1] else col[0] 
-                           for col in state_stats.columns.values]
-    
-    state_stats = state_stats.rename(columns={
-        'idps_present_sum': 'total_idps',
-        'idps_present_mean': 'mean_idps_per_event',
-        'idps_present_count': 'num_events',
-        'lga_nunique': 'num_lgas_affected',
-        'date_min': 'first_event',
-        'date_max': 'last_event'
-    })
-    
-    # ========================================================================
-    # Save processed data
-    # ========================================================================
-    
-    print("\n💾 Saving processed files...")
-    
-    # 1. Full cleaned dataset
-    output_full = f"{output_dir}/dtm_displacement_data_cleaned.csv"
-    df_clean.to_csv(output_full, index=False)
-    print(f"✅ Saved: {output_full} ({len(df_clean):,} records)")
-    
-    # 2. Monthly aggregated events
-    output_monthly = f"{output_dir}/displacement_events_monthly.csv"
-    events_monthly.to_csv(output_monthly, index=False)
-    print(f"✅ Saved: {output_monthly} ({len(events_monthly):,} events)")
-    
-    # 3. LGA statistics
-    output_lga = f"{output_dir}/displacement_statistics_by_lga.csv"
-    lga_stats.to_csv(output_lga, index=False)
-    print(f"✅ Saved: {output_lga} ({len(lga_stats)} LGAs)")
-    
-    # 4. State statistics
-    output_state = f"{output_dir}/displacement_statistics_by_state.csv"
-    state_stats.to_csv(output_state, index=False)
-    print(f"✅ Saved: {output_state} ({len(state_stats)} states)")
-    
-    # 5. Excel with all sheets
-    output_excel = f"{output_dir}/dtm_displacement_processed.xlsx"
-    with pd.ExcelWriter(output_excel, engine='openpyxl') as writer:
-        df_clean.to_excel(writer, sheet_name='All_Records', index=False)
-        events_monthly.to_excel(writer, sheet_name='Monthly_Events', index=False)
-        lga_stats.to_excel(writer, sheet_name='LGA_Statistics', index=False)
-        state_stats.to_excel(writer, sheet_name='State_Statistics', index=False)
-    print(f"✅ Saved: {output_excel}")
-    
-    # ========================================================================
-    # Print summary
-    # ========================================================================
-    
-    print_processing_summary(df_clean, events_monthly, lga_stats, state_stats)
+    state_stats = fine.dropna(subset=['state']).groupby('state', observed=True).agg(
+        total_idps=('total_idps', 'sum'),
+        num_events=('num_records', 'sum'),
+        num_lgas_affected=('lga', 'nunique'),
+        first_event=('first_date', 'min'),
+        last_event=('last_date', 'max')
+    )
+    state_stats.insert(1, 'mean_idps_per_event', state_stats['total_idps'] / state_stats['num_events'])
+    state_stats = state_stats.reset_index()
     
     return df_clean, events_monthly, lga_stats, state_stats
 
 
-def categorize_hazard(reason):
-    """Categorize displacement reason into primary hazard type"""
-    if pd.isna(reason):
-        return 'Unknown'
-    
-    reason_lower = reason.lower()
-    
-    # Priority order: Natural disaster > Conflict > Insecurity
-    if 'natural disaster' in reason_lower:
-        return 'Natural Disaster'
-    elif 'conflict' in reason_lower:
-        return 'Conflict'
-    elif 'insecurity' in reason_lower:
-        return 'Insecurity'
-    else:
-        return 'Other'
-
-
 def print_processing_summary(df_clean, events_monthly, lga_stats, state_stats):
     """Print summary of processed data"""
     
@@ -262,9 +334,11 @@ def print_processing_summary(df_clean, events_monthly, lga_stats, state_stats):
     print(f"   Max IDPs single event:   {df_clean['idps_present'].max():,}")
     
     print(f"\n🌊 Displacement by Primary Hazard:")
+    hazard_idps = df_clean.groupby('primary_hazard', observed=True)['idps_present'].sum()
+    all_idps = df_clean['idps_present'].sum()
     for hazard, count in df_clean['primary_hazard'].value_counts().items():
-        total_idps = df_clean[df_clean['primary_hazard'] == hazard]['idps_present'].sum()
-        pct = total_idps / df_clean['idps_present'].sum() * 100
+        total_idps = hazard_idps.get(hazard, 0)
+        pct = total_idps / all_idps * 100
         print(f"   {hazard:20s} {count:5,} records, {total_idps:12,} IDPs ({pct:5.1f}%)")
     
     print(f"\n🏆 Top 5 Most Affected States:")
@@ -310,11 +384,17 @@ Output files created in data/:
   - displacement_events_monthly.csv (monthly aggregated events)
   - displacement_statistics_by_lga.csv (LGA-level statistics)
   - displacement_statistics_by_state.csv (state-level statistics)
-  - dtm_displacement_processed.xlsx (all sheets in one file)
+  - dtm_displacement_processed/ (all sheets, one Parquet file each)
+  - dtm_displacement_processed.xlsx (all sheets in one file, with --emit-xlsx)
+
+Cleaned tables are also cached as Parquet in data/cache/; re-runs on an
+unchanged input file load them instead of re-parsing the workbook.
 
 Usage:
   python process_dtm_data.py
   python process_dtm_data.py --input path/to/dtm_data.xlsx --output data/
+  python process_dtm_data.py --no-cache
+  python process_dtm_data.py --emit-xlsx
         """
     )
     
@@ -330,12 +410,34 @@ Usage:
         help='Output directory for processed files'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore the Parquet cache in <output>/cache and re-read the Excel file'
+    )
+    
+    parser.add_argument(
+        '--emit-csv',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='Write the CSV outputs (default: on; ibf_database reads them)'
+    )
+    
+    parser.add_argument(
+        '--emit-xlsx',
+        action='store_true',
+        help='Also write the multi-sheet Excel workbook (default: Parquet sheets)'
+    )
+    
     args = parser.parse_args()
     
     try:
         df_clean, events_monthly, lga_stats, state_stats = process_dtm_displacement_data(
             input_file=args.input,
-            output_dir=args.output
+            output_dir=args.output,
+            use_cache=not args.no_cache,
+            emit_csv=args.emit_csv,
+            emit_xlsx=args.emit_xlsx
         )
         
         print("\n" + "="*70)
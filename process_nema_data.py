@@ -10,9 +10,56 @@ import numpy as np
 from pathlib import Path
 import re
 
+from ranking import pct_rank
+from table_io import (
+    load_cached_tables, save_cached_tables, write_parquet, write_csv, write_excel, read_excel
+)
+
+# Standard names for the flood sheet columns (any others pass through)
+NEMA_COLUMNS = {
+    'S/N': 'event_id',
+    'STATEs': 'state_raw',
+    'LGA': 'lga_raw',
+    'COMMUNITITY': 'community',
+    'DISASTER TYPE': 'disaster_type',
+    'YEAR': 'year',
+    'NATURE OF DAMAGE': 'damage_description',
+    'NO OF AFFECTED': 'affected_raw',
+    'NO OF DEATHS': 'deaths_raw',
+    'LATITUDE': 'latitude_raw',
+    'LONGITUDE': 'longitude_raw'
+}
+
+# Common state name variations (after strip/title-casing)
+STATE_NAME_MAPPING = {
+    'Fct': 'FCT',
+    'Federal Capital Territory': 'FCT',
+    'Cross Rivers': 'Cross River',
+    'Rivers ': 'Rivers',
+    'Akwa Ibom ': 'Akwa Ibom',
+}
+
+# Geopolitical zones
+REGIONS = {
+    'North_West': ['Jigawa', 'Kaduna', 'Kano', 'Katsina', 'Kebbi', 'Sokoto', 'Zamfara'],
+    'North_East': ['Adamawa', 'Bauchi', 'Borno', 'Gombe', 'Taraba', 'Yobe'],
+    'North_Central': ['Benue', 'FCT', 'Kogi', 'Kwara', 'Nasarawa', 'Niger', 'Plateau'],
+    'South_West': ['Ekiti', 'Lagos', 'Ogun', 'Ondo', 'Osun', 'Oyo'],
+    'South_East': ['Abia', 'Anambra', 'Ebonyi', 'Enugu', 'Imo'],
+    'South_South': ['Akwa Ibom', 'Bayelsa', 'Cross River', 'Delta', 'Edo', 'Rivers']
+}
+STATE_TO_REGION = {state: region for region, states in REGIONS.items() for state in states}
+
+# Trailing "LGA" suffix on local government names
+LGA_SUFFIX = re.compile(r'\s+lga$', re.IGNORECASE)
+
+
 def process_nema_flood_data(
     input_file='/mnt/user-data/uploads/nema_data.xlsx',
-    output_dir='data'
+    output_dir='data',
+    use_cache=True,
+    emit_csv=True,
+    emit_xlsx=False
 ):
     """
     Process NEMA flood data for IBF system
@@ -24,6 +71,11 @@ def process_nema_flood_data(
     Args:
         input_file: Path to NEMA Excel file
         output_dir: Where to save processed files
+        use_cache: Reuse the Parquet tables in <output_dir>/cache when the
+            input file is unchanged (skips Excel parsing and cleaning)
+        emit_csv: Write the CSV outputs (read by ibf_database)
+        emit_xlsx: Write the multi-sheet Excel workbook; otherwise the same
+            sheets are written as a directory of Parquet files
     """
     
     print("="*70)
@@ -33,9 +85,85 @@ def process_nema_flood_data(
     # Create output directory
     Path(output_dir).mkdir(exist_ok=True)
     
+    cache_dir = Path(output_dir) / 'cache'
+    tables = load_cached_tables(cache_dir, 'nema', input_file, __file__) if use_cache else None
+    if tables is not None:
+        print(f"\n📂 Input unchanged since last run - using cached tables in {cache_dir}")
+        df_clean, state_year, lga_summary, state_summary = tables
+    else:
+        df_clean, state_year, lga_summary, state_summary = build_nema_tables(input_file)
+        if use_cache:
+            save_cached_tables(cache_dir, 'nema', input_file, __file__,
+                               [df_clean, state_year, lga_summary, state_summary])
+    
+    # ========================================================================
+    # Save processed data
+    # ========================================================================
+    
+    print("\n💾 Saving processed files...")
+    
+    if emit_csv:
+        # 1. Full cleaned dataset
+        output_full = f"{output_dir}/nema_flood_data_cleaned.csv"
+        write_csv(df_clean, output_full)
+        print(f"✅ Saved: {output_full} ({len(df_clean):,} records)")
+        
+        # 2. State-year aggregation
+        output_state_year = f"{output_dir}/nema_flood_by_state_year.csv"
+        write_csv(state_year, output_state_year)
+        print(f"✅ Saved: {output_state_year} ({len(state_year)} records)")
+        
+        # 3. LGA summary with risk scores
+        output_lga = f"{output_dir}/nema_flood_risk_by_lga.csv"
+        write_csv(lga_summary, output_lga)
+        print(f"✅ Saved: {output_lga} ({len(lga_summary)} LGAs)")
+        
+        # 4. State summary
+        output_state = f"{output_dir}/nema_flood_summary_by_state.csv"
+        write_csv(state_summary, output_state)
+        print(f"✅ Saved: {output_state} ({len(state_summary)} states)")
+    
+    # 5. All sheets in one workbook, or one Parquet file per sheet
+    sheets = {
+        'All_Events': df_clean,
+        'State_Year': state_year,
+        'LGA_Risk_Scores': lga_summary,
+        'State_Summary': state_summary
+    }
+    if emit_xlsx:
+        output_excel = f"{output_dir}/nema_flood_processed.xlsx"
+        write_excel(output_excel, sheets)
+        print(f"✅ Saved: {output_excel}")
+    else:
+        output_sheets = Path(output_dir) / 'nema_flood_processed'
+        output_sheets.mkdir(exist_ok=True)
+        for sheet_name, df in sheets.items():
+            write_parquet(df, output_sheets / f'{sheet_name}.parquet')
+        print(f"✅ Saved: {output_sheets}/ ({len(sheets)} Parquet sheets)")
+    
+    # ========================================================================
+    # Print summary
+    # ========================================================================
+    
+    print_processing_summary(df_clean, state_summary, lga_summary)
+    
+    return df_clean, state_year, lga_summary, state_summary
+
+
+def build_nema_tables(input_file):
+    """
+    Load the NEMA workbook and build the cleaned, state-year, LGA and state tables
+    
+    Args:
+        input_file: Path to NEMA Excel file
+    
+    Returns:
+        (df_clean, state_year, lga_summary, state_summary)
+    """
+    
     # Load NEMA data
     print(f"\n📂 Loading data from: {input_file}")
-    df = pd.read_excel(input_file, sheet_name='_flood_2006-2022')
+    df = read_excel(input_file, '_flood_2006-2022')
     
     print(f"✅ Loaded {len(df):,} flood event records")
     print(f"   Years: 2006-2022")
@@ -48,19 +176,7 @@ def process_nema_flood_data(
     print("\n🔧 Cleaning and standardizing data...")
     
     # 1. Standardize column names
-    df_clean = df.rename(columns={
-        'S/N': 'event_id',
-        'STATEs': 'state_raw',
-        'LGA': 'lga_raw',
-        'COMMUNITITY': 'community',
-        'DISASTER TYPE': 'disaster_type',
-        'YEAR': 'year',
-        'NATURE OF DAMAGE': 'damage_description',
-        'NO OF AFFECTED': 'affected_raw',
-        'NO OF DEATHS': 'deaths_raw',
-        'LATITUDE': 'latitude_raw',
-        'LONGITUDE': 'longitude_raw'
-    })
+    df_clean = df.rename(columns=NEMA_COLUMNS)
     
     # 2. Clean disaster type
     df_clean['disaster_type'] = df_clean['disaster_type'].str.strip().str.title()
@@ -71,18 +187,26 @@ def process_nema_flood_data(
     df_clean = df_clean[df_clean['year'] > 2000]  # Filter invalid years
     
     # 4. Standardize state names
-    df_clean['state'] = df_clean['state_raw'].apply(standardize_state_name)
+    state_names = df_clean['state_raw'].astype(str).str.strip().str.title()
+    df_clean['state'] = (
+        state_names.map(STATE_NAME_MAPPING).fillna(state_names)
+        .where(df_clean['state_raw'].notna())
+    )
     
     # 5. Clean LGA names
-    df_clean['lga'] = df_clean['lga_raw'].apply(standardize_lga_name)
+    df_clean['lga'] = (
+        df_clean['lga_raw'].astype(str).str.strip().str.title()
+        .str.replace(LGA_SUFFIX, '', regex=True)
+        .where(df_clean['lga_raw'].notna())
+    )
     
-    # 6. Clean numeric fields
-    df_clean['affected'] = df_clean['affected_raw'].apply(clean_number)
-    df_clean['deaths'] = df_clean['deaths_raw'].apply(clean_number)
+    # 6. Clean numeric fields (thousands separators are stripped from text cells)
+    df_clean['affected'] = _to_numeric(df_clean['affected_raw'], strip_commas=True)
+    df_clean['deaths'] = _to_numeric(df_clean['deaths_raw'], strip_commas=True)
     
     # 7. Clean coordinates
-    df_clean['latitude'] = df_clean['latitude_raw'].apply(clean_coordinate)
-    df_clean['longitude'] = df_clean['longitude_raw'].apply(clean_coordinate)
+    df_clean['latitude'] = _to_numeric(df_clean['latitude_raw'])
+    df_clean['longitude'] = _to_numeric(df_clean['longitude_raw'])
     
     # Validate coordinates (Nigeria bounds: ~4-14°N, ~3-15°E)
     df_clean.loc[
@@ -95,12 +219,25 @@ def process_nema_flood_data(
     ] = np.nan
     
     # 8. Add derived fields
-    df_clean['has_coordinates'] = df_clean['latitude'].notna() & df_clean['longitude'].notna()
-    df_clean['has_impact_data'] = df_clean['affected'].notna() | df_clean['deaths'].notna()
-    df_clean['severity'] = df_clean.apply(categorize_severity, axis=1)
+    lat = df_clean['latitude'].to_numpy(dtype=float)
+    lon = df_clean['longitude'].to_numpy(dtype=float)
+    affected = df_clean['affected'].to_numpy(dtype=float)
+    deaths = df_clean['deaths'].to_numpy(dtype=float)
+    df_clean['has_coordinates'] = ~(np.isnan(lat) | np.isnan(lon))
+    df_clean['has_impact_data'] = ~(np.isnan(affected) & np.isnan(deaths))
+    # Severity tiers (missing impact figures count as zero)
+    affected = np.where(np.isnan(affected), 0.0, affected)
+    deaths = np.where(np.isnan(deaths), 0.0, deaths)
+    df_clean['severity'] = np.select(
+        [(deaths > 50) | (affected > 10000),
+         (deaths > 10) | (affected > 5000),
+         (deaths > 0) | (affected > 1000)],
+        ['catastrophic', 'severe', 'moderate'],
+        default='minor'
+    )
     
     # 9. Add geopolitical zones
-    df_clean['region'] = df_clean['state'].apply(assign_region)
+    df_clean['region'] = df_clean['state'].map(STATE_TO_REGION).fillna('Unknown')
     
     print(f"✅ Cleaned {len(df_clean):,} valid records")
     
@@ -110,47 +247,34 @@ def process_nema_flood_data(
     
     print("\n📊 Creating aggregated summaries...")
     
+    # Compact dtypes: the groupby keys below hash small integer codes
+    # instead of Python strings
+    for col in ['state', 'lga', 'region', 'severity', 'disaster_type']:
+        df_clean[col] = df_clean[col].astype('category')
+    
     # State-year aggregation
-    state_year = df_clean.groupby(['state', 'year', 'region']).agg({
-        'event_id': 'count',
-        'affected': 'sum',
-        'deaths': 'sum',
-        'lga': 'nunique',
-        'has_coordinates': 'sum'
-    }).reset_index()
-    
-    state_year = state_year.rename(columns={
-        'event_id': 'num_events',
-        'lga': 'num_lgas_affected',
-        'has_coordinates': 'events_with_coords'
-    })
+    state_year = df_clean.groupby(['state', 'year', 'region'], observed=True).agg(
+        num_events=('event_id', 'count'),
+        affected=('affected', 'sum'),
+        deaths=('deaths', 'sum'),
+        num_lgas_affected=('lga', 'nunique'),
+        events_with_coords=('has_coordinates', 'sum')
+    ).reset_index()
     
     print(f"✅ Created state-year aggregation: {len(state_year)} records")
     
     # LGA summary statistics
-    lga_summary = df_clean[df_clean['lga'].notna()].groupby(['state', 'lga']).agg({
-        'event_id': 'count',
-        'affected': ['sum', 'mean', 'max'],
-        'deaths': ['sum', 'mean'],
-        'year': ['min', 'max'],
-        'has_coordinates': 'sum'
-    }).reset_index()
-    
-    # Flatten columns
-    lga_summary.columns = ['_'.join(col).strip('_') if col[1] else col[0] 
-                           for col in lga_summary.columns.values]
-    
-    lga_summary = lga_summary.rename(columns={
-        'event_id_count': 'total_events',
-        'affected_sum': 'total_affected',
-        'affected_mean': 'mean_affected_per_event',
-        'affected_max': 'max_affected_single_event',
-        'deaths_sum': 'total_deaths',
-        'deaths_mean': 'mean_deaths_per_event',
-        'year_min': 'first_event_year',
-        'year_max': 'last_event_year',
-        'has_coordinates_sum': 'events_with_coords'
-    })
+    lga_summary = df_clean[df_clean['lga'].notna()].groupby(['state', 'lga'], observed=True).agg(
+        total_events=('event_id', 'count'),
+        total_affected=('affected', 'sum'),
+        mean_affected_per_event=('affected', 'mean'),
+        max_affected_single_event=('affected', 'max'),
+        total_deaths=('deaths', 'sum'),
+        mean_deaths_per_event=('deaths', 'mean'),
+        first_event_year=('year', 'min'),
+        last_event_year=('year', 'max'),
+        events_with_coords=('has_coordinates', 'sum')
+    ).reset_index()
     
     # Calculate risk score
     lga_summary['years_with_events'] = lga_summary['last_event_year'] - lga_summary['first_event_year'] + 1
@@ -159,173 +283,50 @@ def process_nema_flood_data(
     ).round(2)
     
     # Simple flood risk score (0-100)
-    lga_summary['flood_risk_score'] = (
-        (lga_summary['total_events'].rank(pct=True) * 0.3 +
-         lga_summary['events_per_year'].rank(pct=True) * 0.3 +
-         lga_summary['total_affected'].fillna(0).rank(pct=True) * 0.4) * 100
-    ).round(1)
+    lga_summary['flood_risk_score'] = np.round(
+        (pct_rank(lga_summary['total_events'].to_numpy()) * 0.3 +
+         pct_rank(lga_summary['events_per_year'].to_numpy()) * 0.3 +
+         pct_rank(lga_summary['total_affected'].fillna(0).to_numpy()) * 0.4) * 100,
+        1
+    )
     
     print(f"✅ Created LGA summary: {len(lga_summary)} LGAs")
     
     # State summary
-    state_summary = df_clean.groupby('state').agg({
-        'event_id': 'count',
-        'affected': 'sum',
-        'deaths': 'sum',
-        'lga': 'nunique',
-        'year': ['min', 'max'],
-        'region': lambda x: x.mode()[0] if len(x) > 0 else 'Unknown'
-    }).reset_index()
-    
-    state_summary.columns = ['_'.join(col).strip('_') if col[1] else col[0] 
-                            for col in state_summary.columns.values]
-    
-    state_summary = state_summary.rename(columns={
-        'event_id_count': 'total_events',
-        'affected_sum': 'total_affected',
-        'deaths_sum': 'total_deaths',
-        'lga_nunique': 'num_lgas_affected',
-        'year_min': 'first_event_year',
-        'year_max': 'last_event_year',
-        'region_<lambda>': 'region'
-    })
+    state_summary = df_clean.groupby('state', observed=True).agg(
+        total_events=('event_id', 'count'),
+        total_affected=('affected', 'sum'),
+        total_deaths=('deaths', 'sum'),
+        num_lgas_affected=('lga', 'nunique'),
+        first_event_year=('year', 'min'),
+        last_event_year=('year', 'max'),
+        region=('region', 'first')  # region is a function of state
+    ).reset_index()
     
     print(f"✅ Created state summary: {len(state_summary)} states")
     
-    # ========================================================================
-    # Save processed data
-    # ========================================================================
-    
-    print("\n💾 Saving processed files...")
-    
-    # 1. Full cleaned dataset
-    output_full = f"{output_dir}/nema_flood_data_cleaned.csv"
-    df_clean.to_csv(output_full, index=False)
-    print(f"✅ Saved: {output_full} ({len(df_clean):,} records)")
-    
-    # 2. State-year aggregation
-    output_state_year = f"{output_dir}/nema_flood_by_state_year.csv"
-    state_year.to_csv(output_state_year, index=False)
-    print(f"✅ Saved: {output_state_year} ({len(state_year)} records)")
-    
-    # 3. LGA summary with risk scores
-    output_lga = f"{output_dir}/nema_flood_risk_by_lga.csv"
-    lga_summary.to_csv(output_lga, index=False)
-    print(f"✅ Saved: {output_lga} ({len(lga_summary)} LGAs)")
-    
-    # 4. State summary
-    output_state = f"{output_dir}/nema_flood_summary_by_state.csv"
-    state_summary.to_csv(output_state, index=False)
-    print(f"✅ Saved: {output_state} ({len(state_summary)} states)")
-    
-    # 5. Excel with all sheets
-    output_excel = f"{output_dir}/nema_flood_processed.xlsx"
-    with pd.ExcelWriter(output_excel, engine='openpyxl') as writer:
-        df_clean.to_excel(writer, sheet_name='All_Events', index=False)
-        state_year.to_excel(writer, sheet_name='State_Year', index=False)
-        lga_summary.to_excel(writer, sheet_name='LGA_Risk_Scores', index=False)
-        state_summary.to_excel(writer, sheet_name='State_Summary', index=False)
-    print(f"✅ Saved: {output_excel}")
-    
-    # ========================================================================
-    # Print summary
-    # ========================================================================
-    
-    print_processing_summary(df_clean, state_summary, lga_summary)
-    
     return df_clean, state_year, lga_summary, state_summary
 
 
 # Helper functions
 
-def clean_number(x):
-    """Clean and convert to number"""
-    if pd.isna(x):
-        return np.nan
-    if isinstance(x, (int, float)):
-        return x
-    try:
-        return float(str(x).replace(',', '').strip())
-    except:
-        return np.nan
-
-
-def clean_coordinate(x):
-    """Clean coordinate values"""
-    if pd.isna(x):
-        return np.nan
-    try:
-        return float(str(x).strip())
-    except:
-        return np.nan
-
-
-def standardize_state_name(state):
-    """Standardize state names"""
-    if pd.isna(state):
-        return None
-    
-    state = str(state).strip().title()
-    
-    # Common variations
-    state_mapping = {
-        'Fct': 'FCT',
-        'Federal Capital Territory': 'FCT',
-        'Cross Rivers': 'Cross River',
-        'Rivers ': 'Rivers',
-        'Akwa Ibom ': 'Akwa Ibom',
-    }
-    
-    return state_mapping.get(state, state)
-
-
-def standardize_lga_name(lga):
-    """Standardize LGA names"""
-    if pd.isna(lga):
-        return None
-    
-    lga = str(lga).strip().title()
-    
-    # Remove common suffixes
-    lga = re.sub(r'\s+Lga$', '', lga, flags=re.IGNORECASE)
-    
-    return lga
-
-
-def categorize_severity(row):
-    """Categorize flood severity"""
-    affected = row['affected'] if pd.notna(row['affected']) else 0
-    deaths = row['deaths'] if pd.notna(row['deaths']) else 0
-    
-    if deaths > 50 or affected > 10000:
-        return 'catastrophic'
-    elif deaths > 10 or affected > 5000:
-        return 'severe'
-    elif deaths > 0 or affected > 1000:
-        return 'moderate'
-    else:
-        return 'minor'
-
-
-def assign_region(state):
-    """Assign geopolitical zone"""
-    if pd.isna(state):
-        return 'Unknown'
-    
-    regions = {
-        'North_West': ['Jigawa', 'Kaduna', 'Kano', 'Katsina', 'Kebbi', 'Sokoto', 'Zamfara'],
-        'North_East': ['Adamawa', 'Bauchi', 'Borno', 'Gombe', 'Taraba', 'Yobe'],
-        'North_Central': ['Benue', 'FCT', 'Kogi', 'Kwara', 'Nasarawa', 'Niger', 'Plateau'],
-        'South_West': ['Ekiti', 'Lagos', 'Ogun', 'Ondo', 'Osun', 'Oyo'],
-        'South_East': ['Abia', 'Anambra', 'Ebonyi', 'Enugu', 'Imo'],
-        'South_South': ['Akwa Ibom', 'Bayelsa', 'Cross River', 'Delta', 'Edo', 'Rivers']
-    }
-    
-    for region, states in regions.items():
-        if state in states:
-            return region
-    
-    return 'Unknown'
+def _to_numeric(values, strip_commas=False):
+    """Convert a raw column to float, turning unparseable cells into NaN"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    
+    # Mixed object column: Python str() of int/float cells round-trips exactly
+    text = values.astype(str)
+    if strip_commas:
+        text = text.str.replace(',', '', regex=False)
+    numbers = pd.to_numeric(text.str.strip(), errors='coerce')
+    
+    # Boolean cells count as 1/0 ('True' would not parse); isin also matches
+    # 1/0 number cells, which convert to the same values
+    flags = values.isin([True, False])
+    if flags.any():
+        numbers[flags] = values[flags].astype(float)
+    return numbers
 
 
 def print_processing_summary(df_clean, state_summary, lga_summary):
@@ -389,12 +390,34 @@ if __name__ == "__main__":
         help='Output directory'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore the Parquet cache in <output>/cache and re-read the Excel file'
+    )
+    
+    parser.add_argument(
+        '--emit-csv',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='Write the CSV outputs (default: on; ibf_database reads them)'
+    )
+    
+    parser.add_argument(
+        '--emit-xlsx',
+        action='store_true',
+        help='Also write the multi-sheet Excel workbook (default: Parquet sheets)'
+    )
+    
     args = parser.parse_args()
     
     try:
         df_clean, state_year, lga_summary, state_summary = process_nema_flood_data(
             input_file=args.input,
-            output_dir=args.output
+            output_dir=args.output,
+            use_cache=not args.no_cache,
+            emit_csv=args.emit_csv,
+            emit_xlsx=args.emit_xlsx
         )
         
         print("\n" + "="*70)
@@ -30,6 +30,7 @@ from climada.engine import ImpactCalc
 from climada.engine.unsequa import InputVar, CalcImpact
 
 from config import Config, create_config
+from sample_stats import summarize_samples
 from advanced_multi_hazard import (
     MLEnhancedVulnerability, AdaptiveImpactFunction,
     MultiHazardInteraction, HazardContext, CompoundingFactors
@@ -108,7 +109,9 @@ class QualityController:
         if len(hazard.event_id) == 0:
             return False, ["Hazard has no events"]
         
-        if np.all(hazard.intensity.data == 0):
+        # Stored entries only; any() stops at the first nonzero instead of
+        # building a boolean copy (explicit zeros can be stored, so not nnz)
+        if not hazard.intensity.data.any():
             warnings.append("Hazard intensity is all zeros")
         
         if hazard.intensity.shape[0] < 5:
@@ -132,22 +135,26 @@ class QualityController:
         warnings = []
         errors = []
         
-        # Check for NaN values
-        if forecast_results['forecasted_displacement'].isna().any():
-            errors.append("NaN values in forecast output")
-        
-        # Check for unrealistic values
-        max_displacement = forecast_results['forecasted_displacement'].max()
-        if max_displacement > 5e6:  # >5M is unrealistic for Nigeria
-            warnings.append(f"Very high displacement forecast: {max_displacement:,.0f}")
+        disp = forecast_results['forecasted_displacement'].to_numpy(dtype=float)
         
-        # Check uncertainty range
-        p05 = forecast_results['forecasted_displacement'].quantile(0.05)
-        p95 = forecast_results['forecasted_displacement'].quantile(0.95)
-        uncertainty_ratio = p95 / (p05 + 1)
+        # Check for NaN values (the checks below skip them, like pandas)
+        nan_mask = np.isnan(disp)
+        if nan_mask.any():
+            errors.append("NaN values in forecast output")
+            disp = disp[~nan_mask]
         
-        if uncertainty_ratio > self.config.validation.max_forecast_error_factor:
-            warnings.append(f"High uncertainty: {uncertainty_ratio:.1f}x range")
+        if disp.size:
+            # Check for unrealistic values
+            max_displacement = disp.max()
+            if max_displacement > 5e6:  # >5M is unrealistic for Nigeria
+                warnings.append(f"Very high displacement forecast: {max_displacement:,.0f}")
+            
+            # Check uncertainty range
+            p05, p95 = np.percentile(disp, [5, 95])
+            uncertainty_ratio = p95 / (p05 + 1)
+            
+            if uncertainty_ratio > self.config.validation.max_forecast_error_factor:
+                warnings.append(f"High uncertainty: {uncertainty_ratio:.1f}x range")
         
         # Check for sufficient samples
         if len(forecast_results) < 100:
@@ -216,8 +223,10 @@ class AlertManager:
         Returns:
             AlertDecision object
         """
-        mean_disp = forecast_results['forecasted_displacement'].mean()
-        p90_disp = forecast_results['forecasted_displacement'].quantile(0.90)
+        disp = forecast_results['forecasted_displacement'].to_numpy(dtype=float)
+        disp = disp[~np.isnan(disp)]  # NaN samples are skipped, as in pandas
+        mean_disp = disp.mean() if disp.size else np.nan
+        p90_disp = np.percentile(disp, 90) if disp.size else np.nan
         
         # Determine alert level
         alert_level = self._determine_alert_level(mean_disp, p90_disp)
@@ -237,10 +246,8 @@ class AlertManager:
         affected_states = list(context.keys())
         
         # Estimate displacement by state (simplified)
-        displacement_by_state = {
-            state: mean_disp / len(affected_states)
-            for state in affected_states
-        }
+        per_state = mean_disp / len(affected_states) if affected_states else 0.0
+        displacement_by_state = dict.fromkeys(affected_states, per_state)
         
         # Generate recommended actions
         actions = self._generate_recommendations(alert_level, mean_disp, affected_states)
@@ -287,9 +294,9 @@ class AlertManager:
         confidence = quality_score
         
         # Adjust based on uncertainty
-        cv = forecast_results['forecasted_displacement'].std() / (
-            forecast_results['forecasted_displacement'].mean() + 1
-        )
+        disp = forecast_results['forecasted_displacement'].to_numpy(dtype=float)
+        disp = disp[~np.isnan(disp)]  # NaN samples are skipped, as in pandas
+        cv = disp.std(ddof=1) / (disp.mean() + 1)  # ddof=1 as in Series.std
         
         if cv < 0.3:  # Low uncertainty
             confidence *= 1.1
@@ -662,7 +669,10 @@ class ProductionForecastEngine:
     ) -> ForecastMetrics:
         """Calculate comprehensive forecast metrics"""
         
-        disp = results['forecasted_displacement']
+        # Skip NaN samples as pandas did (n_samples still counts every row);
+        # np.percentile alone would turn every quantile into NaN
+        disp = results['forecasted_displacement'].to_numpy(dtype=float)
+        mean_disp, max_disp, (p05, p50, p95) = summarize_samples(disp, [5, 50, 95])
         
         # Get uncertainty decomposition (average across hazards)
         haz_unc = np.mean([u.get('hazard_variance', 0.33) for u in uncertainty_outputs.values()])
@@ -693,11 +703,11 @@ class ProductionForecastEngine:
             n_samples=len(disp),
             n_ensemble_members=results.groupby('hazard_type')['sample_id'].nunique().mean(),
             spatial_coverage_km2=923768,  # Nigeria area
-            mean_displacement=float(disp.mean()),
-            median_displacement=float(disp.median()),
-            p05_displacement=float(disp.quantile(0.05)),
-            p95_displacement=float(disp.quantile(0.95)),
-            max_displacement=float(disp.max()),
+            mean_displacement=float(mean_disp),
+            median_displacement=float(p50),
+            p05_displacement=float(p05),
+            p95_displacement=float(p95),
+            max_displacement=float(max_disp),
             hazard_uncertainty_pct=haz_unc * 100,
             exposure_uncertainty_pct=exp_unc * 100,
             vulnerability_uncertainty_pct=vul_unc * 100,
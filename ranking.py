@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ranking helpers shared by the NEMA processor and the IBF database
+"""
+
+import numpy as np
+
+
+def pct_rank(values):
+    """Percentile rank of a NaN-free array with ties averaged, same as Series.rank(pct=True)"""
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    avg_rank = np.cumsum(counts) - (counts - 1) / 2
+    return avg_rank[inverse] / len(values)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Run the DTM and NEMA processing pipelines together
+The two pipelines share no state, so each runs in its own process and
+writes its own output files - nothing but a status flag comes back.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import sys
+
+from process_dtm_data import process_dtm_displacement_data
+from process_nema_data import process_nema_flood_data
+
+
+def _run_pipeline(func, kwargs):
+    """Run one pipeline in a worker; drop the returned frames to avoid pickling them back"""
+    func(**kwargs)
+    return func.__name__
+
+
+def run_all(
+    dtm_input='/mnt/user-data/uploads/2017_2024_Nigeria_displacement_events.xlsx',
+    nema_input='/mnt/user-data/uploads/nema_data.xlsx',
+    output_dir='data',
+    use_cache=True
+):
+    """
+    Process the DTM and NEMA workbooks in parallel
+
+    Args:
+        dtm_input: Path to DTM Excel file
+        nema_input: Path to NEMA Excel file
+        output_dir: Where to save processed files
+        use_cache: Reuse the Parquet tables in <output_dir>/cache when inputs are unchanged
+
+    Returns:
+        dict mapping pipeline name to None on success or the raised exception
+    """
+    jobs = {
+        'DTM': (process_dtm_displacement_data,
+                dict(input_file=dtm_input, output_dir=output_dir, use_cache=use_cache)),
+        'NEMA': (process_nema_flood_data,
+                 dict(input_file=nema_input, output_dir=output_dir, use_cache=use_cache)),
+    }
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {executor.submit(_run_pipeline, func, kwargs): name
+                   for name, (func, kwargs) in jobs.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+                results[name] = None
+            except Exception as e:
+                results[name] = e
+
+    print("\n" + "="*70)
+    print("PIPELINE STATUS")
+    print("="*70)
+    for name in jobs:
+        error = results[name]
+        print(f"{'✅' if error is None else '❌'} {name}: {'done' if error is None else error}")
+    print("="*70)
+
+    return results
+
+
+# ============================================================================
+# Command Line Interface
+# ============================================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Process DTM and NEMA data for Nigeria IBF system in parallel',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Runs process_dtm_data.py and process_nema_data.py in two worker processes.
+Console output from the two pipelines may interleave.
+
+Usage:
+  python run_all.py
+  python run_all.py --dtm-input path/to/dtm.xlsx --nema-input path/to/nema.xlsx --output data/
+        """
+    )
+
+    parser.add_argument(
+        '--dtm-input',
+        default='/mnt/user-data/uploads/2017_2024_Nigeria_displacement_events.xlsx',
+        help='Path to DTM Excel file'
+    )
+
+    parser.add_argument(
+        '--nema-input',
+        default='/mnt/user-data/uploads/nema_data.xlsx',
+        help='Path to NEMA Excel file'
+    )
+
+    parser.add_argument(
+        '--output',
+        default='data',
+        help='Output directory for processed files'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore the Parquet cache in <output>/cache and re-read the Excel files'
+    )
+
+    args = parser.parse_args()
+
+    results = run_all(
+        dtm_input=args.dtm_input,
+        nema_input=args.nema_input,
+        output_dir=args.output,
+        use_cache=not args.no_cache
+    )
+
+    if any(error is not None for error in results.values()):
+        sys.exit(1)
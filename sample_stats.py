@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sample statistics shared by the forecast engines
+"""
+
+import numpy as np
+
+
+def summarize_samples(values, percentiles):
+    """
+    Mean, max and percentiles of the non-NaN samples (NaN skipped, as in pandas)
+    
+    Args:
+        values: Sample values
+        percentiles: Percentiles to compute (0-100)
+    
+    Returns:
+        (mean, max, percentiles array) - all NaN when no sample is valid
+    """
+    values = np.asarray(values, dtype=float)
+    valid = values[~np.isnan(values)]
+    if not valid.size:
+        return np.nan, np.nan, np.full(len(percentiles), np.nan)
+    return valid.mean(), valid.max(), np.percentile(valid, percentiles)
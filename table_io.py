@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Table I/O helpers shared by the data processing scripts
+Excel reading, CSV/Parquet/Excel writing and the Parquet table cache
+"""
+
+import pandas as pd
+from pathlib import Path
+import json
+
+
+def _source_stamp(input_file, code_file):
+    """
+    Identify an input file version by path, mtime and size
+    
+    The mtimes of the processing module and of this module are included
+    too: the cached tables are only valid for the code that built them.
+    """
+    stat = Path(input_file).stat()
+    return {'input': str(Path(input_file).resolve()), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+            'code_mtime_ns': [Path(f).stat().st_mtime_ns for f in (code_file, __file__)]}
+
+
+def load_cached_tables(cache_dir, prefix, input_file, code_file):
+    """
+    Return the cached tables for input_file, or None if missing or stale
+
+    Args:
+        cache_dir: Directory holding the cached Parquet tables
+        prefix: Name prefix of this pipeline's cache files
+        input_file: Source file the tables were built from
+        code_file: Module that built the tables (its edits invalidate the cache)
+    """
+    sidecar = cache_dir / f'{prefix}_source.json'
+    if not sidecar.exists():
+        return None
+
+    try:
+        meta = json.loads(sidecar.read_text())
+    except ValueError:
+        return None
+    if meta.get('source') != _source_stamp(input_file, code_file):
+        return None
+
+    files = [cache_dir / name for name in meta.get('tables', [])]
+    if not files or not all(f.exists() for f in files):
+        return None
+    return [pd.read_parquet(f) for f in files]
+
+
+def save_cached_tables(cache_dir, prefix, input_file, code_file, tables):
+    """Write tables as Parquet plus a sidecar recording the source file stat"""
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        names = []
+        for i, df in enumerate(tables):
+            name = f'{prefix}_table{i}.parquet'
+            write_parquet(df, cache_dir / name)
+            names.append(name)
+        sidecar = {'source': _source_stamp(input_file, code_file), 'tables': names}
+        (cache_dir / f'{prefix}_source.json').write_text(json.dumps(sidecar))
+    except (ImportError, OSError) as e:
+        print(f"⚠️  Could not write Parquet cache: {e}")
+
+
+def write_parquet(df, path):
+    """Write a table as zstd Parquet, storing mixed-type object columns as strings"""
+    try:
+        df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+    except (ValueError, TypeError):
+        # Mixed-type object columns (raw spreadsheet cells) -> strings
+        mixed = {col: 'string' for col in df.columns if df[col].dtype == object}
+        df.astype(mixed).to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+
+
+def write_csv(df, path, columns=None):
+    """
+    Write a DataFrame (or a subset of its columns) to CSV with pyarrow's C writer
+
+    Falls back to DataFrame.to_csv when pyarrow is missing or cannot convert
+    the frame. The pyarrow output parses back to equal values, but the
+    text differs from to_csv: string fields and the header are quoted,
+    booleans are written as true/false and whole-number floats lose '.0'
+    (so an all-whole float column reads back as integers).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        df.to_csv(path, columns=columns, index=False)
+        return
+
+    try:
+        table = pa.Table.from_pandas(df, columns=columns, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns (raw spreadsheet cells) - let pandas format them
+        df.to_csv(path, columns=columns, index=False)
+        return
+
+    # Match pandas' formatting where pyarrow differs: midnight-only timestamps
+    # as plain dates, categoricals as their labels
+    for i, field in enumerate(table.schema):
+        column = df[field.name]
+        if pa.types.is_timestamp(field.type) and (column.dropna() == column.dropna().dt.normalize()).all():
+            table = table.set_column(i, field.name, table.column(i).cast(pa.date32()))
+        elif pa.types.is_dictionary(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+
+    pa_csv.write_csv(table, path, pa_csv.WriteOptions(quoting_style='needed'))
+
+
+def write_excel(output_excel, sheets):
+    """Write {sheet_name: DataFrame} to one workbook with xlsxwriter, falling back to openpyxl"""
+    try:
+        writer = pd.ExcelWriter(output_excel, engine='xlsxwriter')
+    except ImportError:
+        writer = pd.ExcelWriter(output_excel, engine='openpyxl')
+    with writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def read_excel(input_file, sheet_name, **kwargs):
+    """Read a worksheet with the Rust calamine parser, falling back to openpyxl"""
+    try:
+        return pd.read_excel(input_file, sheet_name=sheet_name, engine='calamine', **kwargs)
+    except ImportError:
+        # python-calamine not installed; pandas opens openpyxl workbooks read-only
+        return pd.read_excel(input_file, sheet_name=sheet_name, engine='openpyxl', **kwargs)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Regression tests for the vectorized rewrites of the data pipeline
+Each test checks a rewritten computation against the straightforward
+pandas (or per-LGA) version it replaced.
+
+Run with: python -m unittest test_regressions
+"""
+
+import os
+import unittest
+from unittest import mock
+import importlib.util
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import tempfile
+
+from ranking import pct_rank
+from sample_stats import summarize_samples
+
+
+def _has_module(name):
+    return importlib.util.find_spec(name) is not None
+
+
+# ============================================================================
+# Ranking
+# ============================================================================
+
+class TestPercentileRank(unittest.TestCase):
+    """pct_rank and the risk scores built on it"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # Plenty of ties, as in integer event counts
+        self.values = rng.integers(0, 8, 200).astype(float)
+
+    def test_matches_series_rank(self):
+        """Ties are averaged exactly like Series.rank(pct=True)"""
+        expected = pd.Series(self.values).rank(pct=True).to_numpy()
+        np.testing.assert_allclose(pct_rank(self.values), expected)
+
+    def test_conflict_risk(self):
+        """IBFDatabase conflict risk equals the rank-based formula it replaced"""
+        from ibf_database import IBFDatabase
+
+        df = pd.DataFrame({'dtm_events_per_year': self.values})
+        df.loc[::17, 'dtm_events_per_year'] = np.nan
+
+        risk = IBFDatabase.__new__(IBFDatabase)._calculate_conflict_risk(df)
+        expected = (df['dtm_events_per_year'].fillna(0).rank(pct=True) * 100).round(1)
+        np.testing.assert_allclose(risk.to_numpy(), expected.to_numpy())
+
+
+# ============================================================================
+# DTM aggregation
+# ============================================================================
+
+class TestDTMFineGrouping(unittest.TestCase):
+    """LGA/state tables reduced from the monthly grouping match direct groupbys"""
+
+    @classmethod
+    def setUpClass(cls):
+        from process_dtm_data import build_dtm_tables
+
+        rng = np.random.default_rng(1)
+        n = 400
+        lgas = [('Borno', 'NG008', 'Maiduguri', 'NG008001'),
+                ('Borno', 'NG008', 'Bama', 'NG008002'),
+                ('Yobe', 'NG036', 'Damaturu', 'NG036001'),
+                ('Adamawa', 'NG002', 'Yola North', 'NG002001')]
+        pick = rng.integers(0, len(lgas), n)
+        dates = pd.to_datetime('2018-01-01') + pd.to_timedelta(rng.integers(0, 5 * 365, n), unit='D')
+        reasons = np.array(['Conflict', 'Insecurity', 'Natural disaster',
+                            'Conflict; Natural disaster', 'Communal clashes', None], dtype=object)
+        males = pd.array(rng.integers(0, 500, n), dtype='Int64')
+        males[::9] = pd.NA
+
+        raw = pd.DataFrame({
+            'id': np.arange(n),
+            'reportingDate': dates,
+            'yearReportingDate': dates.year,
+            'monthReportingDate': dates.month,
+            'admin1Name': [lgas[i][0] for i in pick],
+            'admin1Pcode': [lgas[i][1] for i in pick],
+            'admin2Name': [lgas[i][2] for i in pick],
+            'admin2Pcode': [lgas[i][3] for i in pick],
+            'numPresentIdpInd': rng.integers(1, 5000, n),
+            'displacementReason': reasons[rng.integers(0, len(reasons), n)],
+            'numberMales': males,
+            'numberFemales': pd.array(rng.integers(0, 500, n), dtype='Int64'),
+            'roundNumber': rng.integers(20, 45, n),
+            'assessmentType': rng.choice(['BA', 'MS'], n),
+        })
+
+        # The sheet as read_excel returns it, so no Excel engine is needed
+        with mock.patch('process_dtm_data.read_excel', return_value=raw):
+            tables = build_dtm_tables('dtm.xlsx')
+        cls.df_clean, cls.events_monthly, cls.lga_stats, cls.state_stats = tables
+        # Reference groupbys run on plain strings, as the original code did
+        cls.ref = cls.df_clean.astype({col: object for col in ['state', 'lga', 'lga_pcode', 'primary_hazard']})
+
+    def test_lga_statistics(self):
+        """Per-LGA totals, extremes, dates and most common hazard"""
+        expected = self.ref.groupby(['state', 'lga', 'lga_pcode']).agg(
+            total_idps_all_time=('idps_present', 'sum'),
+            mean_idps_per_event=('idps_present', 'mean'),
+            max_idps_single_event=('idps_present', 'max'),
+            num_events=('idps_present', 'count'),
+            first_event_date=('date', 'min'),
+            last_event_date=('date', 'max'),
+            most_common_hazard=('primary_hazard', lambda x: x.mode()[0]),
+        )
+        actual = self.lga_stats.astype({'state': object, 'lga': object, 'lga_pcode': object}).set_index(
+            ['state', 'lga', 'lga_pcode']
+        ).loc[expected.index]
+
+        for col in expected.columns:
+            if col == 'most_common_hazard':
+                self.assertEqual(actual[col].astype(str).tolist(), expected[col].tolist())
+            elif col.endswith('_date'):
+                self.assertTrue((actual[col].to_numpy() == expected[col].to_numpy()).all(), col)
+            else:
+                np.testing.assert_allclose(actual[col].astype(float), expected[col].astype(float), err_msg=col)
+
+    def test_state_statistics(self):
+        """Per-state totals, LGA counts and date range"""
+        expected = self.ref.groupby('state').agg(
+            total_idps=('idps_present', 'sum'),
+            mean_idps_per_event=('idps_present', 'mean'),
+            num_events=('idps_present', 'count'),
+            num_lgas_affected=('lga', 'nunique'),
+            first_event=('date', 'min'),
+            last_event=('date', 'max'),
+        )
+        actual = self.state_stats.astype({'state': object}).set_index('state').loc[expected.index]
+
+        for col in expected.columns:
+            if col in ('first_event', 'last_event'):
+                self.assertTrue((actual[col].to_numpy() == expected[col].to_numpy()).all(), col)
+            else:
+                np.testing.assert_allclose(actual[col].astype(float), expected[col].astype(float), err_msg=col)
+
+    def test_monthly_totals(self):
+        """Monthly IDP totals per LGA and hazard"""
+        keys = ['year', 'month', 'state', 'lga', 'primary_hazard']
+        expected = self.ref.groupby(keys)['idps_present'].sum()
+        actual = self.events_monthly.astype(
+            {'state': object, 'lga': object, 'primary_hazard': object}
+        ).set_index(keys)['total_idps']
+
+        self.assertEqual(len(actual), len(expected))
+        np.testing.assert_allclose(actual.loc[expected.index].astype(float), expected.astype(float))
+
+
+# ============================================================================
+# LGA zonal statistics
+# ============================================================================
+
+@unittest.skipUnless(_has_module('rasterio'), "rasterio needed for the zonal statistics")
+class TestZonalSums(unittest.TestCase):
+    """Label-raster zonal sums match masking the raster once per LGA"""
+
+    def setUp(self):
+        import rasterio
+        from rasterio.transform import from_origin
+        import geopandas as gpd
+        from shapely.geometry import box, Polygon
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.raster_file = Path(self.tmpdir.name) / 'pop.tif'
+
+        rng = np.random.default_rng(2)
+        pop = rng.random((60, 80)).astype(np.float32) * 100
+        pop[rng.random(pop.shape) < 0.1] = -99999  # nodata cells
+
+        transform = from_origin(3.0, 13.0, 0.1, 0.1)
+        with rasterio.open(
+            self.raster_file, 'w', driver='GTiff', height=pop.shape[0], width=pop.shape[1],
+            count=1, dtype='float32', crs='EPSG:4326', transform=transform,
+            nodata=-99999, tiled=True, blockxsize=16, blockysize=16
+        ) as dst:
+            dst.write(pop, 1)
+
+        self.lgas = gpd.GeoDataFrame({
+            'lga_name': ['A', 'B', 'C'],
+            'geometry': [
+                box(3.5, 10.0, 5.0, 12.0),
+                box(5.0, 9.0, 8.0, 11.5),
+                Polygon([(8.5, 7.5), (10.5, 8.0), (9.5, 10.2)]),
+            ]
+        }, crs='EPSG:4326')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _check_backend(self, backend):
+        import rasterio
+        from generate_exposure_lga import _zonal_sums_rasterize, _zonal_sums_mask_chunk
+
+        expected = _zonal_sums_mask_chunk(self.raster_file, self.lgas)
+        self.assertTrue((expected > 0).all())
+
+        with rasterio.open(self.raster_file) as src:
+            actual = _zonal_sums_rasterize(src, self.lgas, backend=backend)
+        np.testing.assert_allclose(actual, expected, rtol=1e-5)
+
+    def test_rasterize_matches_mask(self):
+        """Label-raster sums (bincount/numba backend) agree with the mask path"""
+        self._check_backend('auto')
+
+    def test_scipy_backend_matches_mask(self):
+        """scipy.ndimage.sum_labels backend agrees with the mask path"""
+        self._check_backend('scipy')
+
+
+# ============================================================================
+# Integrated database cache
+# ============================================================================
+
+class TestIntegratedCache(unittest.TestCase):
+    """A database served from the integrated cache equals a freshly built one"""
+
+    def setUp(self):
+        import config
+
+        self.config = config
+        self.saved = {name: getattr(config, name) for name in ('DATA_DIR', 'DATA_FILES', 'USE_PARQUET_CACHE', 'USE_INTEGRATED_CACHE')}
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tmp = Path(self.tmpdir.name)
+
+        rng = np.random.default_rng(3)
+        lgas = pd.DataFrame({
+            'state': ['Borno', 'Borno', 'Yobe', 'Yobe', 'Adamawa', 'Benue'],
+            'lga': ['Maiduguri', 'Bama', 'Damaturu', 'Potiskum', 'Yola North', 'Makurdi'],
+        })
+
+        monthly = lgas.sample(40, replace=True, random_state=3).reset_index(drop=True)
+        monthly['date'] = pd.date_range('2020-01-01', periods=40, freq='MS')
+        monthly['total_idps'] = rng.integers(10, 5000, len(monthly))
+
+        lga_stats = lgas.iloc[:5].copy()
+        lga_stats['total_idps_all_time'] = rng.integers(100, 100000, len(lga_stats))
+        lga_stats['mean_idps_per_event'] = rng.random(len(lga_stats)) * 1000
+        lga_stats['num_events'] = rng.integers(1, 50, len(lga_stats))
+        lga_stats['events_per_year'] = rng.integers(0, 5, len(lga_stats)).astype(float)
+        lga_stats['most_common_hazard'] = ['Conflict', 'Insecurity', 'Conflict', 'Other', 'Natural Disaster']
+
+        nema = lgas.iloc[2:].copy()
+        nema['total_events'] = rng.integers(1, 20, len(nema))
+        nema['total_affected'] = rng.integers(100, 50000, len(nema)).astype(float)
+        nema['events_per_year'] = rng.random(len(nema)) * 3
+        nema['flood_risk_score'] = (rng.random(len(nema)) * 100).round(1)
+
+        exposure = pd.DataFrame({'lga_name': lgas['lga'], 'population': rng.integers(10000, 900000, len(lgas))})
+
+        files = {
+            'dtm_monthly': (monthly, tmp / 'monthly.csv'),
+            'dtm_lga_stats': (lga_stats, tmp / 'lga_stats.csv'),
+            'nema_lga_risk': (nema, tmp / 'nema_lga.csv'),
+            'nema_full': (nema, tmp / 'nema_full.csv'),
+            'exposure_csv': (exposure, tmp / 'exposure.csv'),
+        }
+        for df, path in files.values():
+            df.to_csv(path, index=False)
+
+        config.DATA_DIR = tmp
+        config.DATA_FILES = {name: path for name, (_, path) in files.items()}
+        config.USE_PARQUET_CACHE = True
+        config.USE_INTEGRATED_CACHE = True
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(self.config, name, value)
+        self.tmpdir.cleanup()
+
+    def test_cache_hit_equals_miss(self):
+        """Same integrated table, monthly events and shared key dtypes"""
+        from ibf_database import IBFDatabase
+
+        built = IBFDatabase()
+        cached_files = list((self.config.DATA_DIR / 'cache').glob('integrated_*.feather'))
+        self.assertEqual(len(cached_files), 1)
+
+        cached = IBFDatabase()
+        self.assertIsNone(cached.dtm_lga_stats)  # proves the cache was used
+
+        pd.testing.assert_frame_equal(cached.integrated_lga, built.integrated_lga)
+        self.assertEqual(built.nema_event_count, len(pd.read_csv(self.config.DATA_FILES['nema_full'])))
+        pd.testing.assert_frame_equal(cached.dtm_monthly, built.dtm_monthly)
+        for col in ('state', 'lga'):
+            self.assertEqual(cached.dtm_monthly[col].dtype, cached.integrated_lga[col].dtype)
+        self.assertEqual(cached.get_lga_profile('Yobe', 'Damaturu'), built.get_lga_profile('Yobe', 'Damaturu'))
+
+    def test_failed_write_keeps_previous_cache(self):
+        """A cache write that fails leaves the cache for the older inputs in place"""
+        from ibf_database import IBFDatabase
+
+        IBFDatabase()
+        cache_dir = self.config.DATA_DIR / 'cache'
+        previous = list(cache_dir.glob('integrated_*.feather'))
+
+        # New input mtime -> new cache key
+        exposure = self.config.DATA_FILES['exposure_csv']
+        os.utime(exposure, ns=(exposure.stat().st_atime_ns, exposure.stat().st_mtime_ns + 10**9))
+        with mock.patch.object(pd.DataFrame, 'to_feather', side_effect=OSError('disk full')):
+            IBFDatabase()
+
+        self.assertEqual(list(cache_dir.glob('integrated_*')), previous)
+
+
+# ============================================================================
+# Forecast metrics
+# ============================================================================
+
+class TestForecastMetrics(unittest.TestCase):
+    """Displacement summary used by _calculate_metrics matches the pandas statistics it replaced"""
+
+    def test_quantiles_skip_nan(self):
+        rng = np.random.default_rng(4)
+        disp = rng.lognormal(8, 1, 500)
+        disp[::50] = np.nan
+
+        mean_disp, max_disp, (p05, p50, p95) = summarize_samples(disp, [5, 50, 95])
+
+        series = pd.Series(disp)
+        self.assertAlmostEqual(p05, series.quantile(0.05))
+        self.assertAlmostEqual(p50, series.median())
+        self.assertAlmostEqual(p95, series.quantile(0.95))
+        self.assertAlmostEqual(mean_disp, series.mean())
+        self.assertAlmostEqual(max_disp, series.max())
+
+    def test_all_nan(self):
+        """No valid sample gives NaN statistics instead of an error"""
+        mean_disp, max_disp, quantiles = summarize_samples(np.full(10, np.nan), [5, 50, 95])
+        self.assertTrue(np.isnan([mean_disp, max_disp, *quantiles]).all())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)